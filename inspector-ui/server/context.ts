@@ -40,7 +40,8 @@ export async function createContext(): Promise<ServerContext> {
     config.neo4j.uri,
     config.neo4j.user,
     config.neo4j.password,
-    projectId
+    projectId,
+    config.neo4j.database
   );
 
   // Note: config uses snake_case (api_key)
@@ -49,6 +50,13 @@ export async function createContext(): Promise<ServerContext> {
   // Verify database connectivity
   await neo4j.verifyConnectivity();
 
+  // Indexes and the one-time :Memory label backfill
+  try {
+    await neo4j.ensureSchema();
+  } catch (error) {
+    console.warn('Neo4j schema setup failed - graph lookups may be slow or miss older nodes:', error);
+  }
+
   return {
     qdrant,
     neo4j,
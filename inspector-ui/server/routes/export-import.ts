@@ -70,20 +70,21 @@ exportImportRouter.post('/', async (req: Request, res: Response, next: NextFunct
           filter.must.push({ key: 'deleted', match: { value: false } });
         }
 
-        const points = await qdrant.scroll(collectionName, { filter, limit: 10000 });
-
-        for (const point of points) {
-          const payload = point.payload as Record<string, unknown>;
-          lines.push(JSON.stringify({
-            memory_id: point.id,
-            type,
-            content: payload.content,
-            metadata: payload.metadata,
-            created_at: payload.created_at,
-            updated_at: payload.updated_at,
-            deleted: payload.deleted,
-            project_id: payload.project_id
-          }));
+        // Page through the whole collection; scroll returns one page per call
+        for await (const page of qdrant.iterScroll(collectionName, { filter })) {
+          for (const point of page) {
+            const payload = point.payload;
+            lines.push(JSON.stringify({
+              memory_id: point.id,
+              type,
+              content: payload.content,
+              metadata: payload.metadata,
+              created_at: payload.created_at,
+              updated_at: payload.updated_at,
+              deleted: payload.deleted,
+              project_id: payload.project_id
+            }));
+          }
         }
       } catch {
         // Collection might not exist, skip
@@ -384,23 +384,21 @@ async function runReindex(
         const collectionName = `memory_${type}_${projectId}`;
 
         try {
-          const points = await qdrant.scroll(collectionName, {
+          const toDelete: string[] = [];
+          for await (const page of qdrant.iterScroll(collectionName, {
             filter: {
               must: [
                 { key: 'project_id', match: { value: projectId } }
               ]
-            },
-            limit: 10000
-          });
-
-          const toDelete: string[] = [];
-          for (const point of points) {
-            const payload = point.payload as Record<string, unknown>;
-            const metadata = payload.metadata as Record<string, unknown>;
-            const filePath = metadata?.file_path as string;
-
-            if (filePath && filePath.startsWith(dirPath)) {
-              toDelete.push(String(point.id));
+            }
+          })) {
+            for (const point of page) {
+              const metadata = point.payload.metadata as Record<string, unknown>;
+              const filePath = metadata?.file_path as string;
+
+              if (filePath && filePath.startsWith(dirPath)) {
+                toDelete.push(point.id);
+              }
             }
           }
 
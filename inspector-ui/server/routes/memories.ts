@@ -284,11 +284,11 @@ memoriesRouter.post('/', async (req: Request, res: Response, next: NextFunction)
       }
     );
 
-    // Create relationships if specified - signature: createRelationship(sourceId, relationshipType, targetId)
-    if (input.relationships) {
-      for (const rel of input.relationships) {
-        await neo4j.createRelationship(memoryId, rel.type, rel.targetId);
-      }
+    // Create relationships if specified, batched into one query per type
+    if (input.relationships && input.relationships.length > 0) {
+      await neo4j.createRelationships(
+        input.relationships.map(rel => ({ sourceId: memoryId, type: rel.type, targetId: rel.targetId }))
+      );
     }
 
     const memory = {
@@ -365,11 +365,10 @@ memoriesRouter.put('/:type/:id', async (req: Request, res: Response, next: NextF
     // Update relationships if specified
     // Note: Neo4jAdapter doesn't have deleteRelationships method, so we only add new relationships
     // TODO: Add deleteRelationships to Neo4jAdapter if full relationship replacement is needed
-    if (updates.relationships) {
-      for (const rel of updates.relationships) {
-        // createRelationship signature: (sourceId, relationshipType, targetId)
-        await neo4j.createRelationship(id, rel.type, rel.targetId);
-      }
+    if (updates.relationships && updates.relationships.length > 0) {
+      await neo4j.createRelationships(
+        updates.relationships.map(rel => ({ sourceId: id, type: rel.type, targetId: rel.targetId }))
+      );
     }
 
     const memory = {
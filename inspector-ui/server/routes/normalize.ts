@@ -7,9 +7,24 @@ import { Router, Request, Response, NextFunction } from 'express';
 import { z } from 'zod';
 import type { ServerContext } from '../context.js';
 import { createError } from '../middleware/error-handler.js';
+import type { ScrolledPoint } from '../../../mcp-server/src/types/index.js';
 
 export const normalizeRouter = Router();
 
+// Every matching point in a collection; the adapter's scroll returns one
+// page per call
+async function scrollAll(
+  qdrant: ServerContext['qdrant'],
+  collectionName: string,
+  params: Parameters<ServerContext['qdrant']['iterScroll']>[1]
+): Promise<ScrolledPoint[]> {
+  const points: ScrolledPoint[] = [];
+  for await (const page of qdrant.iterScroll(collectionName, params)) {
+    points.push(...page);
+  }
+  return points;
+}
+
 // Request type with context
 interface ContextRequest extends Request {
   context: ServerContext;
@@ -136,14 +151,13 @@ normalizeRouter.post('/test-results', async (req: Request, res: Response, next:
 
     try {
       // Get test results
-      const points = await qdrant.scroll(collectionName, {
-        filter: { must: mustConditions },
-        limit: 10000
+      const points = await scrollAll(qdrant, collectionName, {
+        filter: { must: mustConditions }
       });
 
       // Group by suite
-      const suiteGroups = new Map<string, typeof points.points>();
-      for (const point of points.points) {
+      const suiteGroups = new Map<string, ScrolledPoint[]>();
+      for (const point of points) {
         const payload = point.payload as Record<string, unknown>;
         const metadata = payload.metadata as Record<string, unknown> | undefined;
         const suiteKey = String(metadata?.suite_id || metadata?.suite_name || 'unknown');
@@ -302,14 +316,14 @@ async function runDeduplication(
 
     try {
       // Get all memories in collection
-      const points = await qdrant.scroll(collectionName, {
+      const points = await scrollAll(qdrant, collectionName, {
         filter: {
           must: [
             { key: 'deleted', match: { value: false } },
             { key: 'project_id', match: { value: projectId } }
           ]
         },
-        limit: 1000
+        withVector: true
       });
 
       // Find duplicates (similarity > 0.95)
@@ -445,14 +459,13 @@ async function runCleanup(
     const collectionName = `memory_${type}_${projectId}`;
 
     try {
-      const points = await qdrant.scroll(collectionName, {
+      const points = await scrollAll(qdrant, collectionName, {
         filter: {
           must: [
             { key: 'deleted', match: { value: true } },
             { key: 'project_id', match: { value: projectId } }
           ]
-        },
-        limit: 1000
+        }
       });
 
       const toDelete: string[] = [];
@@ -506,14 +519,14 @@ async function runEmbeddingRefresh(
     const collectionName = `memory_${type}_${projectId}`;
 
     try {
-      const points = await qdrant.scroll(collectionName, {
+      const points = await scrollAll(qdrant, collectionName, {
         filter: {
           must: [
             { key: 'deleted', match: { value: false } },
             { key: 'project_id', match: { value: projectId } }
           ]
         },
-        limit: 1000
+        withVector: true
       });
 
       // Detect fallback embeddings (all zeros or very low variance)
@@ -16,6 +16,7 @@ export interface Neo4jConfig {
   uri: string;
   user: string;
   password: string;
+  database: string;
 }
 
 export interface Config {
@@ -27,7 +28,7 @@ export interface Config {
 interface TomlConfig {
   voyage?: { api_key?: string };
   qdrant?: { url?: string };
-  neo4j?: { uri?: string; user?: string; password?: string };
+  neo4j?: { uri?: string; user?: string; password?: string; database?: string };
 }
 
 export function loadConfig(): Config {
@@ -44,7 +45,8 @@ export function loadConfig(): Config {
     neo4j: {
       uri: process.env["CLAUDE_MEMORY_NEO4J_URI"] || "bolt://localhost:7687",
       user: process.env["CLAUDE_MEMORY_NEO4J_USER"] || "neo4j",
-      password: process.env["CLAUDE_MEMORY_NEO4J_PASSWORD"] || ""
+      password: process.env["CLAUDE_MEMORY_NEO4J_PASSWORD"] || "",
+      database: process.env["CLAUDE_MEMORY_NEO4J_DATABASE"] || "neo4j"
     }
   };
 
@@ -70,6 +72,9 @@ export function loadConfig(): Config {
       if (fileConfig.neo4j?.password && !process.env["CLAUDE_MEMORY_NEO4J_PASSWORD"]) {
         config.neo4j.password = fileConfig.neo4j.password;
       }
+      if (fileConfig.neo4j?.database && !process.env["CLAUDE_MEMORY_NEO4J_DATABASE"]) {
+        config.neo4j.database = fileConfig.neo4j.database;
+      }
 
       logger.info("Loaded config from TOML", { path: configPath });
     } catch (error) {
@@ -25,7 +25,8 @@ export async function createContext(projectId: string): Promise<ToolContext> {
     config.neo4j.uri,
     config.neo4j.user,
     config.neo4j.password,
-    projectId
+    projectId,
+    config.neo4j.database
   );
   const voyage = new VoyageClient(config.voyage.api_key);
 
@@ -38,6 +39,15 @@ export async function createContext(projectId: string): Promise<ToolContext> {
     });
   }
 
+  // Indexes and the one-time :Memory label backfill
+  try {
+    await neo4j.ensureSchema();
+  } catch (error) {
+    logger.warn("Neo4j schema setup failed - graph lookups may be slow or miss older nodes", {
+      error: String(error)
+    });
+  }
+
   // Ensure collections exist
   await qdrant.ensureAllCollections();
 
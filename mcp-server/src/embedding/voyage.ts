@@ -1,12 +1,17 @@
+import { createHash } from "node:crypto";
 import { logger } from "../utils/logger.js";
 
 const VOYAGE_BASE_URL = "https://api.voyageai.com/v1";
 const MODEL = "voyage-code-3";
 const MAX_BATCH_SIZE = 100;
+// Embeddings kept in memory (about 8 KB each), so re-indexing unchanged
+// content or repeating a query doesn't go back to the API
+const CACHE_SIZE = 1024;
 
 interface EmbeddingResponse {
   data: Array<{
-    embedding: number[];
+    // Base64 of little-endian float32 values (encoding_format: "base64")
+    embedding: string;
     index: number;
   }>;
   usage: {
@@ -16,6 +21,8 @@ interface EmbeddingResponse {
 
 export class VoyageClient {
   private apiKey: string;
+  // Content hash -> embedding, least recently used first
+  private cache = new Map<string, number[]>();
 
   constructor(apiKey: string) {
     this.apiKey = apiKey;
@@ -35,12 +42,58 @@ export class VoyageClient {
       return [];
     }
 
+    const keys = texts.map(cacheKey);
+    const cached = keys.map(key => this.cacheGet(key));
+
+    // Request each uncached text once, even if it repeats within the batch
+    const missing = new Map<string, string>();
+    keys.forEach((key, i) => {
+      if (!cached[i] && !missing.has(key)) {
+        missing.set(key, texts[i]!);
+      }
+    });
+
+    const fetched = new Map<string, number[]>();
+    if (missing.size > 0) {
+      const embeddings = await this.requestEmbeddings([...missing.values()]);
+      let i = 0;
+      for (const key of missing.keys()) {
+        const embedding = embeddings[i++]!;
+        fetched.set(key, embedding);
+        this.cacheSet(key, embedding);
+      }
+    }
+
+    return keys.map((key, i) => cached[i] ?? fetched.get(key)!);
+  }
+
+  private cacheGet(key: string): number[] | undefined {
+    const embedding = this.cache.get(key);
+    if (embedding) {
+      // Re-insert to mark as most recently used
+      this.cache.delete(key);
+      this.cache.set(key, embedding);
+    }
+    return embedding;
+  }
+
+  private cacheSet(key: string, embedding: number[]): void {
+    this.cache.set(key, embedding);
+    if (this.cache.size > CACHE_SIZE) {
+      const oldest = this.cache.keys().next().value;
+      if (oldest !== undefined) {
+        this.cache.delete(oldest);
+      }
+    }
+  }
+
+  private async requestEmbeddings(texts: string[]): Promise<number[][]> {
     if (texts.length > MAX_BATCH_SIZE) {
       // Split into chunks
       const results: number[][] = [];
       for (let i = 0; i < texts.length; i += MAX_BATCH_SIZE) {
         const chunk = texts.slice(i, i + MAX_BATCH_SIZE);
-        const chunkResults = await this.embedBatch(chunk);
+        const chunkResults = await this.requestEmbeddings(chunk);
         results.push(...chunkResults);
       }
       return results;
@@ -54,7 +107,9 @@ export class VoyageClient {
       },
       body: JSON.stringify({
         model: MODEL,
-        input: texts
+        input: texts,
+        // Much smaller to transfer and decode than a JSON array of floats
+        encoding_format: "base64"
       })
     });
 
@@ -68,6 +123,18 @@ export class VoyageClient {
 
     // Sort by index to maintain order
     const sorted = data.data.sort((a, b) => a.index - b.index);
-    return sorted.map(d => d.embedding);
+    return sorted.map(d => decodeEmbedding(d.embedding));
   }
 }
+
+// Full SHA-256 digest, base64 rather than hex so each key is 44 chars, not 64
+function cacheKey(text: string): string {
+  return createHash("sha256").update(text).digest("base64");
+}
+
+function decodeEmbedding(encoded: string): number[] {
+  const bytes = Buffer.from(encoded, "base64");
+  // Float32Array views need a 4-byte aligned offset; pooled Buffers may not be
+  const aligned = bytes.byteOffset % 4 === 0 ? bytes : Buffer.from(bytes);
+  return Array.from(new Float32Array(aligned.buffer, aligned.byteOffset, aligned.byteLength / 4));
+}
@@ -1,13 +1,212 @@
-import neo4j, { Driver, Session } from "neo4j-driver";
+import neo4j, { Driver, type Record as Neo4jRecord, type RoutingControl } from "neo4j-driver";
 import { logger } from "../utils/logger.js";
 
+// Every memory node also carries the shared :Memory label, so lookups by
+// memory_id can use one index instead of scanning every node in the database
+const SCHEMA_QUERIES = [
+  `CREATE INDEX memory_id_idx IF NOT EXISTS FOR (n:Memory) ON (n.memory_id)`,
+  `CREATE INDEX memory_project_id_idx IF NOT EXISTS FOR (n:Memory) ON (n.project_id)`
+];
+
+// Nodes written before the :Memory label was introduced. The scan covers the
+// whole database, so it runs in batches of its own transactions and only
+// until it has completed once, which is recorded by a marker node
+const BACKFILL_MEMORY_LABEL_MIGRATION = "memory_label_backfill";
+
+const MIGRATION_DONE_QUERY =
+  `RETURN EXISTS { MATCH (m:SchemaMigration {name: $name}) } as done`;
+
+const BACKFILL_MEMORY_LABEL_QUERY =
+  `MATCH (n)
+   WHERE n.memory_id IS NOT NULL AND NOT n:Memory
+   CALL { WITH n SET n:Memory } IN TRANSACTIONS OF 10000 ROWS`;
+
+const MARK_MIGRATION_DONE_QUERY =
+  `MERGE (m:SchemaMigration {name: $name})
+   ON CREATE SET m.completed_at = datetime()`;
+
+// Cypher texts are built once and reused verbatim, so the server's query
+// plan cache, which is keyed on the exact text, keeps hitting
+
+// Update and delete only report whether a node matched, so they return a
+// constant rather than the whole node with all of its properties
+const UPDATE_NODE_QUERY =
+  `MATCH (n:Memory {memory_id: $memoryId, project_id: $projectId})
+   SET n += $props, n.updated_at = datetime()
+   RETURN 1 as ok`;
+
+const DELETE_NODE_QUERY =
+  `MATCH (n:Memory {memory_id: $memoryId, project_id: $projectId})
+   SET n.deleted = true, n.updated_at = datetime()
+   RETURN 1 as ok`;
+
+// Both counts in one query, so one round trip and one transaction
+const STATISTICS_QUERY =
+  `RETURN
+     COUNT { MATCH (n:Memory {project_id: $projectId}) WHERE n.deleted IS NULL OR n.deleted = false } as nodeCount,
+     COUNT { MATCH (a:Memory {project_id: $projectId})-[r]->(b:Memory {project_id: $projectId}) } as relationshipCount`;
+
+// Labels and relationship types can't be parameters on Neo4j 5.15 (dynamic
+// labels need 5.26, and APOC isn't guaranteed), so they are interpolated:
+// only plain identifiers are accepted, which rules out Cypher injection
+const IDENTIFIER_REGEX = /^[A-Za-z_][A-Za-z0-9_]*$/;
+
+function assertIdentifier(kind: string, value: string): void {
+  if (!IDENTIFIER_REGEX.test(value)) {
+    throw new Error(`Invalid ${kind} '${value}': use letters, digits and underscores only`);
+  }
+}
+
+// Keys getRelated always sets on its results
+export const RESERVED_RELATED_FIELDS: ReadonlySet<string> = new Set(["memory_id", "distance"]);
+
+// Queries that interpolate a label/type are built once per label/type.
+// Labels, types and depths come from callers and may be any identifier-shaped
+// value, so each cache only keeps its most recently used entries
+const QUERY_CACHE_SIZE = 128;
+
+const createNodeQueries = new Map<string, string>();
+const createRelationshipQueries = new Map<string, string>();
+const createRelationshipsQueries = new Map<string, string>();
+const relationshipPatterns = new Map<string, string>();
+const getRelatedQueries = new Map<string, string>();
+
+// build() runs only on a miss and may throw, so invalid input is never cached
+function cachedQuery(cache: Map<string, string>, key: string, build: () => string): string {
+  let query = cache.get(key);
+  if (query !== undefined) {
+    // Re-insert so the map's insertion order tracks recency
+    cache.delete(key);
+  } else {
+    query = build();
+    if (cache.size >= QUERY_CACHE_SIZE) {
+      const oldest = cache.keys().next();
+      if (!oldest.done) {
+        cache.delete(oldest.value);
+      }
+    }
+  }
+  cache.set(key, query);
+  return query;
+}
+
+function createNodeQuery(label: string): string {
+  return cachedQuery(createNodeQueries, label, () => {
+    assertIdentifier("node label", label);
+    return `CREATE (n:${label}:Memory $props)`;
+  });
+}
+
+function createRelationshipQuery(relationshipType: string): string {
+  return cachedQuery(createRelationshipQueries, relationshipType, () => {
+    assertIdentifier("relationship type", relationshipType);
+    return `MATCH (a:Memory {memory_id: $sourceId, project_id: $projectId})
+       MATCH (b:Memory {memory_id: $targetId, project_id: $projectId})
+       CREATE (a)-[r:${relationshipType} $props]->(b)`;
+  });
+}
+
+// Relationship properties can't be a per-row map inside the CREATE pattern,
+// so they are assigned with SET
+function createRelationshipsQuery(relationshipType: string): string {
+  return cachedQuery(createRelationshipsQueries, relationshipType, () => {
+    assertIdentifier("relationship type", relationshipType);
+    return `UNWIND $rows AS row
+       MATCH (a:Memory {memory_id: row.sourceId, project_id: $projectId})
+       MATCH (b:Memory {memory_id: row.targetId, project_id: $projectId})
+       CREATE (a)-[r:${relationshipType}]->(b)
+       SET r = row.props
+       RETURN count(r) as created`;
+  });
+}
+
+// Type filters are deduplicated and sorted, so the same set of types always
+// yields the same query text however the caller ordered it
+function relationshipPattern(relationshipTypes: string[] | undefined): string {
+  if (!relationshipTypes || relationshipTypes.length === 0) {
+    return "";
+  }
+  const types = [...new Set(relationshipTypes)].sort();
+  const key = types.join("|");
+  return cachedQuery(relationshipPatterns, key, () => {
+    for (const type of types) {
+      assertIdentifier("relationship type", type);
+    }
+    return `:${key}`;
+  });
+}
+
+// Quantifier bounds must be literals in Cypher, so the depth can't be a
+// parameter; each (types, depth, projection) combination is built once and
+// the handful of texts that result are reused
+function getRelatedQuery(relPattern: string, depth: number, withFields: boolean): string {
+  return cachedQuery(getRelatedQueries, `${relPattern}/${depth}/${withFields}`, () => {
+    if (!Number.isInteger(depth) || depth < 1) {
+      throw new Error(`Invalid depth '${depth}': must be a positive integer`);
+    }
+
+    // With a field list only those properties are read and shipped back,
+    // instead of hydrating every property of every related node
+    const projection = withFields
+      ? "related.memory_id AS memory_id, [field IN $fields | related[field]] AS fieldValues"
+      : "related";
+
+    // Quantified path pattern (Neo4j 5.9+): only the hop list is bound, no
+    // path objects are built just to measure their length. Each node is
+    // reduced to its shortest distance before LIMIT, so nodes reachable by
+    // several paths don't use up the limit, and properties are only read
+    // for the rows that survive it
+    return `MATCH (start:Memory {memory_id: $entityId, project_id: $projectId})
+       MATCH (start) (()-[hops${relPattern}]-()){1,${depth}} (related)
+       WHERE related <> start AND related.project_id = $projectId
+         AND (related.deleted IS NULL OR related.deleted = false)
+       WITH related, min(size(hops)) as distance
+       ORDER BY distance
+       LIMIT $limit
+       RETURN ${projection}, distance`;
+  });
+}
+
 export class Neo4jAdapter {
   private driver: Driver;
   private projectId: string;
+  private database: string;
 
-  constructor(uri: string, user: string, password: string, projectId: string) {
+  constructor(uri: string, user: string, password: string, projectId: string, database: string = "neo4j") {
     this.driver = neo4j.driver(uri, neo4j.auth.basic(user, password));
     this.projectId = projectId;
+    this.database = database;
+  }
+
+  // Always name the database: without it the driver first asks the server
+  // to resolve the user's home database
+  private execute(
+    cypher: string,
+    params: Record<string, unknown>,
+    routing: RoutingControl = neo4j.routing.WRITE
+  ) {
+    return this.driver.executeQuery(cypher, params, { database: this.database, routing });
+  }
+
+  // Map each record as it streams in rather than buffering the driver's
+  // record list first, so large results are not held twice
+  private collect<T>(
+    cypher: string,
+    params: Record<string, unknown>,
+    map: (record: Neo4jRecord) => T,
+    routing: RoutingControl = neo4j.routing.READ
+  ): Promise<T[]> {
+    return this.driver.executeQuery(cypher, params, {
+      database: this.database,
+      routing,
+      resultTransformer: async (result) => {
+        const rows: T[] = [];
+        for await (const record of result) {
+          rows.push(map(record));
+        }
+        return rows;
+      }
+    });
   }
 
   async verifyConnectivity(): Promise<void> {
@@ -15,67 +214,83 @@ export class Neo4jAdapter {
     logger.info("Neo4j connection verified");
   }
 
+  /**
+   * Create the :Memory indexes if missing and, the first time only, label
+   * older memory nodes that predate the shared label. Every entry point
+   * that opens the database calls this before using the adapter.
+   */
+  async ensureSchema(): Promise<void> {
+    for (const cypher of SCHEMA_QUERIES) {
+      await this.execute(cypher, {});
+    }
+
+    const params = { name: BACKFILL_MEMORY_LABEL_MIGRATION };
+    const status = await this.execute(MIGRATION_DONE_QUERY, params, neo4j.routing.READ);
+    if (status.records[0]?.get("done") === true) {
+      return;
+    }
+
+    // CALL ... IN TRANSACTIONS only runs in an auto-commit transaction, which
+    // executeQuery doesn't use
+    const session = this.driver.session({
+      database: this.database,
+      defaultAccessMode: neo4j.session.WRITE
+    });
+    try {
+      const result = await session.run(BACKFILL_MEMORY_LABEL_QUERY);
+      const labelled = result.summary.counters.updates().labelsAdded;
+      if (labelled > 0) {
+        logger.info("Added :Memory label to existing nodes", { count: labelled });
+      }
+    } finally {
+      await session.close();
+    }
+
+    await this.execute(MARK_MIGRATION_DONE_QUERY, params);
+  }
+
   async createNode(
     label: string,
     memoryId: string,
     properties: Record<string, unknown>
   ): Promise<void> {
-    const session = this.driver.session();
-    try {
-      await session.run(
-        `CREATE (n:${label} $props)`,
-        {
-          props: {
-            memory_id: memoryId,
-            project_id: this.projectId,
-            created_at: new Date().toISOString(),
-            ...properties
-          }
+    await this.execute(
+      createNodeQuery(label),
+      {
+        props: {
+          memory_id: memoryId,
+          project_id: this.projectId,
+          created_at: new Date().toISOString(),
+          ...properties
         }
-      );
-    } finally {
-      await session.close();
-    }
+      }
+    );
   }
 
   async updateNode(
     memoryId: string,
     properties: Record<string, unknown>
   ): Promise<boolean> {
-    const session = this.driver.session();
-    try {
-      const result = await session.run(
-        `MATCH (n {memory_id: $memoryId, project_id: $projectId})
-         SET n += $props, n.updated_at = datetime()
-         RETURN n`,
-        {
-          memoryId,
-          projectId: this.projectId,
-          props: properties
-        }
-      );
-      return result.records.length > 0;
-    } finally {
-      await session.close();
-    }
+    const result = await this.execute(
+      UPDATE_NODE_QUERY,
+      {
+        memoryId,
+        projectId: this.projectId,
+        props: properties
+      }
+    );
+    return result.records.length > 0;
   }
 
   async deleteNode(memoryId: string): Promise<boolean> {
-    const session = this.driver.session();
-    try {
-      const result = await session.run(
-        `MATCH (n {memory_id: $memoryId, project_id: $projectId})
-         SET n.deleted = true, n.updated_at = datetime()
-         RETURN n`,
-        {
-          memoryId,
-          projectId: this.projectId
-        }
-      );
-      return result.records.length > 0;
-    } finally {
-      await session.close();
-    }
+    const result = await this.execute(
+      DELETE_NODE_QUERY,
+      {
+        memoryId,
+        projectId: this.projectId
+      }
+    );
+    return result.records.length > 0;
   }
 
   async createRelationship(
@@ -84,22 +299,49 @@ export class Neo4jAdapter {
     targetId: string,
     properties?: Record<string, unknown>
   ): Promise<void> {
-    const session = this.driver.session();
-    try {
-      await session.run(
-        `MATCH (a {memory_id: $sourceId, project_id: $projectId})
-         MATCH (b {memory_id: $targetId, project_id: $projectId})
-         CREATE (a)-[r:${relationshipType} $props]->(b)`,
-        {
-          sourceId,
-          targetId,
-          projectId: this.projectId,
-          props: properties || {}
-        }
+    await this.execute(
+      createRelationshipQuery(relationshipType),
+      {
+        sourceId,
+        targetId,
+        projectId: this.projectId,
+        props: properties || {}
+      }
+    );
+  }
+
+  /**
+   * Create many relationships with one UNWIND query per relationship type
+   * instead of one round trip each. Pairs whose endpoints don't exist are
+   * skipped, as with createRelationship. Returns the number created.
+   */
+  async createRelationships(
+    relationships: Array<{
+      sourceId: string;
+      type: string;
+      targetId: string;
+      properties?: Record<string, unknown>;
+    }>
+  ): Promise<number> {
+    const rowsByType = new Map<string, Array<Record<string, unknown>>>();
+    for (const rel of relationships) {
+      let rows = rowsByType.get(rel.type);
+      if (rows === undefined) {
+        rows = [];
+        rowsByType.set(rel.type, rows);
+      }
+      rows.push({ sourceId: rel.sourceId, targetId: rel.targetId, props: rel.properties || {} });
+    }
+
+    let created = 0;
+    for (const [type, rows] of rowsByType) {
+      const result = await this.execute(
+        createRelationshipsQuery(type),
+        { rows, projectId: this.projectId }
       );
-    } finally {
-      await session.close();
+      created += result.records[0]?.get("created").toNumber() || 0;
     }
+    return created;
   }
 
   async query(
@@ -120,72 +362,71 @@ export class Neo4jAdapter {
       }
     }
 
-    const session = this.driver.session({ defaultAccessMode: neo4j.session.READ });
-    try {
-      const result = await session.run(cypher, {
+    return this.collect(
+      cypher,
+      {
         ...params,
         projectId: this.projectId
-      });
-      return result.records.map(r => r.toObject());
-    } finally {
-      await session.close();
-    }
+      },
+      r => r.toObject()
+    );
   }
 
   async getRelated(
     entityId: string,
     relationshipTypes: string[] | undefined,
-    depth: number = 1
+    depth: number = 1,
+    limit: number = 50,
+    fields?: string[]
   ): Promise<Record<string, unknown>[]> {
-    const session = this.driver.session({ defaultAccessMode: neo4j.session.READ });
-    try {
-      let relPattern = "";
-      if (relationshipTypes && relationshipTypes.length > 0) {
-        relPattern = `:${relationshipTypes.join("|")}`;
-      }
+    // memory_id and distance are always set on each result; a projected
+    // property of the same name would overwrite them
+    const reserved = fields?.find(field => RESERVED_RELATED_FIELDS.has(field));
+    if (reserved !== undefined) {
+      throw new Error(`Invalid field '${reserved}': memory_id and distance are always returned`);
+    }
 
-      const result = await session.run(
-        `MATCH (start {memory_id: $entityId, project_id: $projectId})
-         MATCH path = (start)-[${relPattern}*1..${depth}]-(related)
-         WHERE related.project_id = $projectId AND (related.deleted IS NULL OR related.deleted = false)
-         RETURN DISTINCT related, length(path) as distance
-         ORDER BY distance
-         LIMIT 50`,
-        {
-          entityId,
-          projectId: this.projectId
-        }
-      );
+    const cypher = getRelatedQuery(relationshipPattern(relationshipTypes), depth, fields !== undefined);
+    const params = {
+      entityId,
+      projectId: this.projectId,
+      fields: fields ?? null,
+      // LIMIT needs an integer; plain JS numbers are sent as floats
+      limit: neo4j.int(limit)
+    };
 
-      return result.records.map(r => ({
-        ...r.get("related").properties,
-        distance: r.get("distance").toNumber()
-      }));
-    } finally {
-      await session.close();
+    if (fields) {
+      return this.collect(cypher, params, r => {
+        const values = r.get("fieldValues") as unknown[];
+        const entity: Record<string, unknown> = { memory_id: r.get("memory_id") };
+        fields.forEach((field, i) => {
+          if (values[i] !== null) {
+            entity[field] = values[i];
+          }
+        });
+        entity["distance"] = r.get("distance").toNumber();
+        return entity;
+      });
     }
+
+    return this.collect(cypher, params, r => ({
+      ...r.get("related").properties,
+      distance: r.get("distance").toNumber()
+    }));
   }
 
   async getStatistics(): Promise<{ nodeCount: number; relationshipCount: number }> {
-    const session = this.driver.session({ defaultAccessMode: neo4j.session.READ });
-    try {
-      const nodeResult = await session.run(
-        `MATCH (n {project_id: $projectId}) WHERE n.deleted IS NULL OR n.deleted = false RETURN count(n) as count`,
-        { projectId: this.projectId }
-      );
-
-      const relResult = await session.run(
-        `MATCH (a {project_id: $projectId})-[r]->(b {project_id: $projectId}) RETURN count(r) as count`,
-        { projectId: this.projectId }
-      );
+    const result = await this.execute(
+      STATISTICS_QUERY,
+      { projectId: this.projectId },
+      neo4j.routing.READ
+    );
 
-      return {
-        nodeCount: nodeResult.records[0]?.get("count").toNumber() || 0,
-        relationshipCount: relResult.records[0]?.get("count").toNumber() || 0
-      };
-    } finally {
-      await session.close();
-    }
+    const record = result.records[0];
+    return {
+      nodeCount: record?.get("nodeCount").toNumber() || 0,
+      relationshipCount: record?.get("relationshipCount").toNumber() || 0
+    };
   }
 
   async close(): Promise<void> {
@@ -1,17 +1,66 @@
-import { QdrantClient } from "@qdrant/js-client-rest";
+import { QdrantClient, type Schemas } from "@qdrant/js-client-rest";
 import { logger } from "../utils/logger.js";
-import type { Point, SearchParams, SearchResult } from "../types/index.js";
-import type { MemoryType, MEMORY_TYPES } from "../types/memory.js";
+import type {
+  Point,
+  ScrollPage,
+  ScrollParams,
+  ScrolledPoint,
+  SearchParams,
+  SearchResult
+} from "../types/index.js";
+import type { MemoryType } from "../types/memory.js";
 
 const VECTOR_SIZE = 1024; // voyage-code-3 dimensions
+const SCROLL_PAGE_SIZE = 256;
+
+type PayloadIndex = { field: string; schema: "keyword" | "bool" };
+
+// Only fields that queries actually filter on are indexed; every index
+// costs memory and work on each upsert. Every query filters on project_id
+// and deleted, so each collection gets those
+const COMMON_PAYLOAD_INDEXES: readonly PayloadIndex[] = [
+  { field: "project_id", schema: "keyword" },
+  { field: "deleted", schema: "bool" }
+];
+
+const PAYLOAD_INDEXES: ReadonlyMap<string, readonly PayloadIndex[]> = new Map([
+  ["function", [
+    { field: "metadata.file_path", schema: "keyword" },
+    { field: "metadata.language", schema: "keyword" }
+  ]],
+  ["code_pattern", [
+    { field: "metadata.language", schema: "keyword" }
+  ]],
+  ["test_result", [
+    { field: "metadata.suite_id", schema: "keyword" },
+    { field: "metadata.suite_name", schema: "keyword" }
+  ]]
+]);
+
+function toQdrantFilter(filter: SearchParams["filter"]) {
+  return filter ? {
+    must: filter.must?.map(m => ({
+      key: m.key,
+      match: { value: m.match.value }
+    }))
+  } : undefined;
+}
 
 export class QdrantAdapter {
   private client: QdrantClient;
   private projectId: string;
+  // Live (not soft-deleted) points of this project; fixed per adapter
+  private activeFilter: Schemas["Filter"];
 
   constructor(url: string, projectId: string) {
     this.client = new QdrantClient({ url });
     this.projectId = projectId;
+    this.activeFilter = {
+      must: [
+        { key: "project_id", match: { value: projectId } },
+        { key: "deleted", match: { value: false } }
+      ]
+    };
   }
 
   collectionName(memoryType: string): string {
@@ -35,25 +84,57 @@ export class QdrantAdapter {
         await this.client.createCollection(name, {
           vectors: {
             size: VECTOR_SIZE,
-            distance: "Cosine"
+            distance: "Cosine",
+            on_disk: true
+          },
+          // int8 copies of the vectors stay in RAM for the HNSW search (4x
+          // smaller than float32); the float32 originals live on disk and
+          // are only read to rescore the top candidates
+          quantization_config: {
+            scalar: {
+              type: "int8",
+              quantile: 0.99,
+              always_ram: true
+            }
           }
         });
         logger.info("Created collection", { name });
       }
+
+      await this.ensurePayloadIndexes(name, memoryType);
     } catch (error) {
       logger.error("Failed to ensure collection", { name, error: String(error) });
       throw error;
     }
   }
 
+  // Creates whichever of the type's indexes are missing, so collections
+  // made before an index was added pick it up on the next start
+  private async ensurePayloadIndexes(name: string, memoryType: string): Promise<void> {
+    const info = await this.client.getCollection(name);
+    const existing = info.payload_schema;
+    const missing = [...COMMON_PAYLOAD_INDEXES, ...(PAYLOAD_INDEXES.get(memoryType) ?? [])]
+      .filter(index => !(index.field in existing));
+
+    await Promise.all(missing.map(index =>
+      this.client.createPayloadIndex(name, {
+        field_name: index.field,
+        field_schema: index.schema,
+        wait: true
+      })
+    ));
+    if (missing.length > 0) {
+      logger.info("Created payload indexes", { name, fields: missing.map(index => index.field) });
+    }
+  }
+
   async ensureAllCollections(): Promise<void> {
     const types: readonly string[] = [
       "requirements", "design", "architecture", "code_pattern", "component",
       "function", "test_result", "test_history", "session", "user_preference"
     ];
-    for (const type of types) {
-      await this.ensureCollection(type);
-    }
+    // Independent collections: check and create them concurrently
+    await Promise.all(types.map(type => this.ensureCollection(type)));
   }
 
   async upsert(collection: string, point: Point): Promise<void> {
@@ -67,44 +148,50 @@ export class QdrantAdapter {
     });
   }
 
-  async upsertBatch(collection: string, points: Point[]): Promise<void> {
+  // With wait = false Qdrant acknowledges once the write is queued rather
+  // than applied; only pass it when nothing reads the points straight back
+  async upsertBatch(collection: string, points: Point[], wait: boolean = true): Promise<void> {
+    // Column-oriented batch: no per-point wrapper objects, and the request
+    // body doesn't repeat the id/vector/payload keys for every point
     await this.client.upsert(collection, {
-      wait: true,
-      points: points.map(p => ({
-        id: p.id,
-        vector: p.vector,
-        payload: p.payload
-      }))
+      wait,
+      batch: {
+        ids: points.map(p => p.id),
+        vectors: points.map(p => p.vector),
+        payloads: points.map(p => p.payload)
+      }
     });
   }
 
   async search(params: SearchParams): Promise<SearchResult[]> {
-    const results: SearchResult[] = [];
+    // Same filter for every collection, so build it once
+    const filter = toQdrantFilter(params.filter);
 
-    for (const collection of params.collections) {
+    // Collections are searched concurrently; hits are still gathered in
+    // collection order so equal scores keep their previous ranking
+    const perCollection = await Promise.all(params.collections.map(async collection => {
       try {
-        const searchResult = await this.client.search(collection, {
+        return await this.client.search(collection, {
           vector: params.vector,
           limit: params.limit,
-          filter: params.filter ? {
-            must: params.filter.must?.map(m => ({
-              key: m.key,
-              match: { value: m.match.value }
-            }))
-          } : undefined,
+          filter,
           with_payload: true
         });
-
-        for (const hit of searchResult) {
-          results.push({
-            id: String(hit.id),
-            score: hit.score,
-            payload: (hit.payload || {}) as Record<string, unknown>
-          });
-        }
       } catch (error) {
         // Collection might not exist yet
         logger.debug("Search failed for collection", { collection, error: String(error) });
+        return [];
+      }
+    }));
+
+    const results: SearchResult[] = [];
+    for (const searchResult of perCollection) {
+      for (const hit of searchResult) {
+        results.push({
+          id: String(hit.id),
+          score: hit.score,
+          payload: (hit.payload || {}) as Record<string, unknown>
+        });
       }
     }
 
@@ -125,12 +212,7 @@ export class QdrantAdapter {
         vector,
         limit,
         score_threshold: scoreThreshold,
-        filter: {
-          must: [
-            { key: "project_id", match: { value: this.projectId } },
-            { key: "deleted", match: { value: false } }
-          ]
-        },
+        filter: this.activeFilter,
         with_payload: false
       });
 
@@ -178,24 +260,63 @@ export class QdrantAdapter {
     }
   }
 
+  // One page of points matching a filter; pass nextOffset back as offset
+  // for the following page
+  async scroll(collection: string, params: ScrollParams = {}): Promise<ScrollPage> {
+    const result = await this.client.scroll(collection, {
+      filter: toQdrantFilter(params.filter),
+      limit: params.limit ?? SCROLL_PAGE_SIZE,
+      offset: params.offset,
+      with_payload: true,
+      with_vector: params.withVector ?? false
+    });
+
+    return {
+      points: result.points.map(point => ({
+        id: String(point.id),
+        ...(point.vector ? { vector: point.vector as number[] } : {}),
+        payload: (point.payload || {}) as Record<string, unknown>
+      })),
+      nextOffset: (result.next_page_offset ?? null) as string | number | null
+    };
+  }
+
+  /**
+   * Yield every page of points matching a filter. The next page is
+   * requested as soon as the current one arrives, so fetching it overlaps
+   * with whatever the caller does with the current page.
+   */
+  async *iterScroll(
+    collection: string,
+    params: Omit<ScrollParams, "offset"> = {}
+  ): AsyncGenerator<ScrolledPoint[]> {
+    let next: Promise<ScrollPage> | null = this.scroll(collection, params);
+    while (next) {
+      const page: ScrollPage = await next;
+      next = page.nextOffset === null
+        ? null
+        : this.scroll(collection, { ...params, offset: page.nextOffset });
+      // If the caller stops early the prefetch is never awaited; don't let
+      // its failure surface as an unhandled rejection
+      next?.catch(() => {});
+      yield page.points;
+    }
+  }
+
   async softDelete(collection: string, id: string): Promise<boolean> {
     try {
-      // Get current point
-      const point = await this.get(collection, id);
-      if (!point) {
+      // Only existence and ownership matter here, so fetch just project_id
+      // rather than the whole payload and vector
+      const [point] = await this.client.retrieve(collection, {
+        ids: [id],
+        with_payload: ["project_id"],
+        with_vector: false
+      });
+      if (point?.payload?.["project_id"] !== this.projectId) {
         return false;
       }
 
-      // Update deleted flag
-      await this.client.setPayload(collection, {
-        wait: true,
-        points: [id],
-        payload: {
-          deleted: true,
-          updated_at: new Date().toISOString()
-        }
-      });
-
+      await this.markDeleted(collection, [id]);
       return true;
     } catch (error) {
       logger.error("Failed to soft delete", { collection, id, error: String(error) });
@@ -203,6 +324,26 @@ export class QdrantAdapter {
     }
   }
 
+  /**
+   * Flag points as deleted in one request. Only the two changed payload
+   * keys are sent; the points' vectors and other payload stay untouched on
+   * the server. Callers are responsible for having scoped the ids to this
+   * project.
+   */
+  async markDeleted(collection: string, ids: string[]): Promise<void> {
+    if (ids.length === 0) {
+      return;
+    }
+    await this.client.setPayload(collection, {
+      wait: true,
+      points: ids,
+      payload: {
+        deleted: true,
+        updated_at: new Date().toISOString()
+      }
+    });
+  }
+
   async getStatistics(): Promise<{ collections: Array<{ name: string; count: number }> }> {
     const stats: { collections: Array<{ name: string; count: number }> } = { collections: [] };
 
@@ -202,7 +202,7 @@ export function registerAnalysisTools(server: McpServer, ctx: ToolContext): void
             const componentResults = await ctx.neo4j.query(
               `MATCH (c:Component {project_id: $projectId})
                WHERE c.name CONTAINS $name OR c.memory_id IN $designIds
-               RETURN c LIMIT 1`,
+               RETURN c.memory_id as memory_id LIMIT 1`,
               {
                 name: input.component_name,
                 designIds: designs.slice(0, 3).map(d => d.id)
@@ -210,9 +210,9 @@ export function registerAnalysisTools(server: McpServer, ctx: ToolContext): void
             );
 
             if (componentResults.length > 0) {
-              const componentNode = componentResults[0] as { c: { memory_id: string } };
+              const component = componentResults[0] as { memory_id: string };
               relatedComponents = await ctx.neo4j.getRelated(
-                componentNode.c.memory_id,
+                component.memory_id,
                 undefined,
                 2
               );
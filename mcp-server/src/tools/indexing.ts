@@ -1,10 +1,11 @@
 import { randomUUID } from "node:crypto";
 import { z } from "zod";
 import { readFileSync, existsSync, readdirSync, statSync } from "node:fs";
-import { join, extname, relative } from "node:path";
+import { join, extname } from "node:path";
 import { McpServer } from "@modelcontextprotocol/sdk/server/mcp.js";
 import type { ToolContext } from "../context.js";
 import { logger } from "../utils/logger.js";
+import { forEachConcurrent, mapAhead } from "../utils/concurrency.js";
 
 function toolResult(data: unknown) {
   return {
@@ -35,11 +36,29 @@ const LANGUAGE_EXTENSIONS: Record<string, string[]> = {
   csharp: [".cs"]
 };
 
+// Reverse of LANGUAGE_EXTENSIONS, so detection is one lookup per file
+const LANGUAGE_BY_EXTENSION = new Map<string, string>(
+  Object.entries(LANGUAGE_EXTENSIONS).flatMap(([lang, exts]) => exts.map(ext => [ext, lang] as const))
+);
+
+/**
+ * Identifiers the class-method pattern can match that are not methods:
+ * constructors/accessors, and control-flow statements inside method bodies
+ * (`if (x) {`, `for (...) {`) which share the `name(...) {` shape.
+ */
+const NON_METHOD_NAMES = new Set([
+  'constructor', 'get', 'set',
+  'if', 'for', 'while', 'switch', 'catch', 'with'
+]);
+
 /**
  * Extracted function information
  * REQ-007-FN-071: Function metadata
+ *
+ * Every extractor builds these with all fields present (className is
+ * explicitly undefined for free functions) so the objects share one shape.
  */
-interface ExtractedFunction {
+export interface ExtractedFunction {
   name: string;
   body: string;
   startLine: number;
@@ -47,25 +66,42 @@ interface ExtractedFunction {
   signature: string;
   isAsync: boolean;
   isMethod: boolean;
-  className?: string;
+  className: string | undefined;
 }
 
+/**
+ * Every JS/TS declaration the extractor recognises, as alternatives of one
+ * pattern so each line is matched once rather than against four expressions.
+ * Groups: 1 indent | 2 class name | 3 async, 4 function name |
+ * 5 arrow function name, 6 async | 7 async, 8 method name
+ */
+const JS_DECLARATION_REGEX = new RegExp(
+  "^(\\s*)(?:" + [
+    // Class declarations (to track method context)
+    /(?:export\s+)?class\s+(\w+)/.source,
+    // Regular function declarations
+    /(?:export\s+)?(async\s+)?function\s+(\w+)\s*\([^)]*\)/.source,
+    // Arrow functions (const name = async? (...) => ...)
+    /(?:export\s+)?(?:const|let|var)\s+(\w+)\s*=\s*(async\s*)?\([^)]*\)\s*(?::\s*[^=]+)?\s*=>/.source,
+    // Class method declarations, including TS member modifiers
+    /(?:(?:public|private|protected|static|readonly|override|abstract)\s+)*(async\s+)?(\w+)\s*\([^)]*\)\s*(?::\s*[^{]+)?\s*\{/.source
+  ].join("|") + ")"
+);
+
+// def function_name(args):
+// async def function_name(args):
+const PY_FUNCTION_REGEX = /^(\s*)(async\s+)?def\s+(\w+)\s*\(([^)]*)\)\s*(?:->\s*[^:]+)?:/;
+// class ClassName:
+const PY_CLASS_REGEX = /^(\s*)class\s+(\w+)/;
+
 /**
  * Extract functions from JavaScript/TypeScript code
  * REQ-007-FN-072: Support JS/TS functions, arrow functions, and methods
  */
-function extractJavaScriptFunctions(content: string): ExtractedFunction[] {
-  const functions: ExtractedFunction[] = [];
+function* iterJavaScriptFunctions(content: string): Generator<ExtractedFunction> {
   const lines = content.split('\n');
-
-  // Regular function declarations
-  const functionRegex = /^(\s*)(?:export\s+)?(?:async\s+)?function\s+(\w+)\s*\(([^)]*)\)/gm;
-  // Arrow functions (const name = async? (...) => ...)
-  const arrowRegex = /^(\s*)(?:export\s+)?(?:const|let|var)\s+(\w+)\s*=\s*(?:async\s*)?\([^)]*\)\s*(?::\s*[^=]+)?\s*=>/gm;
-  // Class method declarations
-  const methodRegex = /^(\s*)(?:async\s+)?(\w+)\s*\(([^)]*)\)\s*(?::\s*[^{]+)?\s*\{/gm;
-  // Class declarations (to track method context)
-  const classRegex = /^(\s*)(?:export\s+)?class\s+(\w+)/gm;
+  const lineStarts = lineStartOffsets(content);
+  const braces = buildBraceIndex(lines);
 
   let currentClass: string | undefined;
   let classIndent = -1;
@@ -73,106 +109,100 @@ function extractJavaScriptFunctions(content: string): ExtractedFunction[] {
   for (let i = 0; i < lines.length; i++) {
     const line = lines[i];
     const lineNum = i + 1;
+    const match = JS_DECLARATION_REGEX.exec(line);
 
     // Track class context
-    const classMatch = classRegex.exec(line);
-    if (classMatch) {
-      currentClass = classMatch[2];
-      classIndent = classMatch[1].length;
-    } else if (currentClass && line.trim().startsWith('}') && line.search(/\S/) <= classIndent) {
-      currentClass = undefined;
-      classIndent = -1;
+    if (match?.[2]) {
+      currentClass = match[2];
+      classIndent = match[1].length;
+      continue;
+    }
+    if (currentClass) {
+      // A closing brace at or left of the class's indent ends the class
+      const first = line.search(/\S/);
+      if (first !== -1 && first <= classIndent && line[first] === '}') {
+        currentClass = undefined;
+        classIndent = -1;
+      }
+    }
+
+    if (!match) {
+      continue;
     }
 
-    // Check for function declaration
-    functionRegex.lastIndex = 0;
-    const funcMatch = functionRegex.exec(line);
-    if (funcMatch) {
-      const indent = funcMatch[1].length;
-      const name = funcMatch[2];
-      const isAsync = line.includes('async ');
+    // Function declaration
+    if (match[4]) {
+      const name = match[4];
+      const isAsync = !!match[3];
 
       // Find the end of the function
-      const endLine = findFunctionEnd(lines, i, indent);
-      const body = lines.slice(i, endLine + 1).join('\n');
+      const endLine = findFunctionEnd(braces, i);
+      const body = sliceLines(content, lineStarts, i, endLine);
 
-      functions.push({
+      yield {
         name,
         body,
         startLine: lineNum,
         endLine: endLine + 1,
         signature: line.trim().replace(/\s*\{.*$/, ''),
         isAsync,
-        isMethod: false
-      });
+        isMethod: false,
+        className: undefined
+      };
       continue;
     }
 
-    // Check for arrow function
-    arrowRegex.lastIndex = 0;
-    const arrowMatch = arrowRegex.exec(line);
-    if (arrowMatch) {
-      const indent = arrowMatch[1].length;
-      const name = arrowMatch[2];
-      const isAsync = line.includes('async ');
+    // Arrow function
+    if (match[5]) {
+      const name = match[5];
+      const isAsync = !!match[6];
 
-      const endLine = findFunctionEnd(lines, i, indent);
-      const body = lines.slice(i, endLine + 1).join('\n');
+      const endLine = findFunctionEnd(braces, i);
+      const body = sliceLines(content, lineStarts, i, endLine);
 
-      functions.push({
+      yield {
         name,
         body,
         startLine: lineNum,
         endLine: endLine + 1,
-        signature: line.trim().replace(/\s*=>\s*\{.*$/, ' =>').replace(/\s*=>\s*[^{].*$/, ' =>'),
+        signature: line.trim().replace(/\s*=>.+$/, ' =>'),
         isAsync,
-        isMethod: false
-      });
+        isMethod: false,
+        className: undefined
+      };
       continue;
     }
 
-    // Check for class method (only if inside a class and not a constructor/getter/setter)
-    if (currentClass) {
-      methodRegex.lastIndex = 0;
-      const methodMatch = methodRegex.exec(line);
-      if (methodMatch && !['constructor', 'get', 'set'].includes(methodMatch[2])) {
-        const indent = methodMatch[1].length;
-        const name = methodMatch[2];
-        const isAsync = line.includes('async ');
+    // Class method (only if inside a class and not a constructor/getter/setter
+    // or a control-flow statement in a method body)
+    if (match[8] && currentClass && !NON_METHOD_NAMES.has(match[8])) {
+      const name = match[8];
+      const isAsync = !!match[7];
 
-        const endLine = findFunctionEnd(lines, i, indent);
-        const body = lines.slice(i, endLine + 1).join('\n');
+      const endLine = findFunctionEnd(braces, i);
+      const body = sliceLines(content, lineStarts, i, endLine);
 
-        functions.push({
-          name,
-          body,
-          startLine: lineNum,
-          endLine: endLine + 1,
-          signature: line.trim().replace(/\s*\{.*$/, ''),
-          isAsync,
-          isMethod: true,
-          className: currentClass
-        });
-      }
+      yield {
+        name,
+        body,
+        startLine: lineNum,
+        endLine: endLine + 1,
+        signature: line.trim().replace(/\s*\{.*$/, ''),
+        isAsync,
+        isMethod: true,
+        className: currentClass
+      };
     }
   }
-
-  return functions;
 }
 
 /**
  * Extract functions from Python code
  * REQ-007-FN-072: Support Python def and async def
  */
-function extractPythonFunctions(content: string): ExtractedFunction[] {
-  const functions: ExtractedFunction[] = [];
+function* iterPythonFunctions(content: string): Generator<ExtractedFunction> {
   const lines = content.split('\n');
-
-  // def function_name(args):
-  // async def function_name(args):
-  const functionRegex = /^(\s*)(async\s+)?def\s+(\w+)\s*\(([^)]*)\)\s*(?:->\s*[^:]+)?:/;
-  // class ClassName:
-  const classRegex = /^(\s*)class\s+(\w+)/;
+  const lineStarts = lineStartOffsets(content);
 
   let currentClass: string | undefined;
   let classIndent = -1;
@@ -182,16 +212,20 @@ function extractPythonFunctions(content: string): ExtractedFunction[] {
     const lineNum = i + 1;
 
     // Track class context
-    const classMatch = classRegex.exec(line);
+    const classMatch = PY_CLASS_REGEX.exec(line);
     if (classMatch) {
       currentClass = classMatch[2];
       classIndent = classMatch[1].length;
-    } else if (currentClass && line.trim() && !line.trim().startsWith('#') && line.search(/\S/) <= classIndent) {
-      currentClass = undefined;
-      classIndent = -1;
+    } else if (currentClass) {
+      // Any code (not blank, not a comment) at or left of the class's indent ends the class
+      const first = line.search(/\S/);
+      if (first !== -1 && first <= classIndent && line[first] !== '#') {
+        currentClass = undefined;
+        classIndent = -1;
+      }
     }
 
-    const match = functionRegex.exec(line);
+    const match = PY_FUNCTION_REGEX.exec(line);
     if (match) {
       const indent = match[1].length;
       const isAsync = !!match[2];
@@ -199,14 +233,14 @@ function extractPythonFunctions(content: string): ExtractedFunction[] {
 
       // Find end of function (next line with same or less indentation that's not empty/comment)
       const endLine = findPythonFunctionEnd(lines, i, indent);
-      const body = lines.slice(i, endLine + 1).join('\n');
+      const body = sliceLines(content, lineStarts, i, endLine);
 
       // Skip dunder methods for class methods
       const isDunder = name.startsWith('__') && name.endsWith('__');
       const isMethod = currentClass !== undefined && indent > classIndent;
 
       if (!isDunder || !isMethod) {
-        functions.push({
+        yield {
           name,
           body,
           startLine: lineNum,
@@ -215,39 +249,119 @@ function extractPythonFunctions(content: string): ExtractedFunction[] {
           isAsync,
           isMethod,
           className: isMethod ? currentClass : undefined
-        });
+        };
       }
     }
   }
+}
+
+/**
+ * Offset of the first character of every line in content
+ */
+function lineStartOffsets(content: string): number[] {
+  const starts = [0];
+  let newline = content.indexOf('\n');
+  while (newline !== -1) {
+    starts.push(newline + 1);
+    newline = content.indexOf('\n', newline + 1);
+  }
+  return starts;
+}
 
-  return functions;
+/**
+ * Take lines first..last (inclusive) from content with a single slice,
+ * rather than copying each line out of a split array and joining them again
+ */
+function sliceLines(content: string, lineStarts: number[], first: number, last: number): string {
+  const end = last + 1 < lineStarts.length ? lineStarts[last + 1]! - 1 : content.length;
+  return content.slice(lineStarts[first], end);
 }
 
 /**
- * Find the end of a brace-delimited function (JS/TS)
+ * Brace nesting of a JS/TS source, computed in one pass over the file so
+ * that locating the end of each function is a lookup rather than a rescan
+ * of everything after it (which is quadratic for nested functions/methods)
  */
-function findFunctionEnd(lines: string[], startIndex: number, startIndent: number): number {
-  let braceCount = 0;
-  let foundOpening = false;
+interface BraceIndex {
+  /** Brace depth before each line */
+  depthBefore: number[];
+  /** First line at or after each line that contains an opening brace */
+  nextOpening: number[];
+  /** Line indexes, ascending, grouped by the brace depth at their end */
+  linesEndingAtDepth: Map<number, number[]>;
+}
 
-  for (let i = startIndex; i < lines.length; i++) {
-    const line = lines[i];
+const OPEN_BRACE = '{'.charCodeAt(0);
+const CLOSE_BRACE = '}'.charCodeAt(0);
 
-    for (const char of line) {
-      if (char === '{') {
-        braceCount++;
-        foundOpening = true;
-      } else if (char === '}') {
-        braceCount--;
+function buildBraceIndex(lines: string[]): BraceIndex {
+  const depthBefore: number[] = new Array(lines.length);
+  const hasOpening: boolean[] = new Array(lines.length);
+  const linesEndingAtDepth = new Map<number, number[]>();
+  let depth = 0;
+
+  for (let i = 0; i < lines.length; i++) {
+    depthBefore[i] = depth;
+    hasOpening[i] = false;
+
+    // Compare UTF-16 code units rather than iterating one-character strings
+    const line = lines[i]!;
+    for (let j = 0; j < line.length; j++) {
+      const code = line.charCodeAt(j);
+      if (code === OPEN_BRACE) {
+        depth++;
+        hasOpening[i] = true;
+      } else if (code === CLOSE_BRACE) {
+        depth--;
       }
     }
 
-    if (foundOpening && braceCount === 0) {
-      return i;
+    const atDepth = linesEndingAtDepth.get(depth);
+    if (atDepth) {
+      atDepth.push(i);
+    } else {
+      linesEndingAtDepth.set(depth, [i]);
     }
   }
 
-  return lines.length - 1;
+  const nextOpening: number[] = new Array(lines.length);
+  let next = lines.length;
+  for (let i = lines.length - 1; i >= 0; i--) {
+    if (hasOpening[i]) {
+      next = i;
+    }
+    nextOpening[i] = next;
+  }
+
+  return { depthBefore, nextOpening, linesEndingAtDepth };
+}
+
+/**
+ * Find the end of a brace-delimited function (JS/TS): the first line, from
+ * the function's opening brace on, that closes back to the depth the
+ * function started at
+ */
+function findFunctionEnd(index: BraceIndex, startIndex: number): number {
+  const lastLine = index.depthBefore.length - 1;
+  const openingLine = index.nextOpening[startIndex]!;
+  const candidates = index.linesEndingAtDepth.get(index.depthBefore[startIndex]!);
+  if (!candidates) {
+    return lastLine;
+  }
+
+  // Binary search for the first candidate at or after the opening brace
+  let low = 0;
+  let high = candidates.length;
+  while (low < high) {
+    const mid = (low + high) >>> 1;
+    if (candidates[mid]! < openingLine) {
+      low = mid + 1;
+    } else {
+      high = mid;
+    }
+  }
+
+  return low < candidates.length ? candidates[low]! : lastLine;
 }
 
 /**
@@ -258,16 +372,16 @@ function findPythonFunctionEnd(lines: string[], startIndex: number, funcIndent:
 
   for (let i = startIndex + 1; i < lines.length; i++) {
     const line = lines[i];
-    const trimmed = line.trim();
+    // One scan gives both the indentation and the first significant character
+    const currentIndent = line.search(/\S/);
 
     // Skip empty lines and comments
-    if (!trimmed || trimmed.startsWith('#')) {
+    if (currentIndent === -1 || line[currentIndent] === '#') {
       continue;
     }
 
     // Check indentation
-    const currentIndent = line.search(/\S/);
-    if (currentIndent !== -1 && currentIndent < bodyIndent) {
+    if (currentIndent < bodyIndent) {
       return i - 1;
     }
   }
@@ -278,46 +392,141 @@ function findPythonFunctionEnd(lines: string[], startIndex: number, funcIndent:
 /**
  * Extract functions based on language
  * REQ-007-FN-070
+ *
+ * Functions are yielded as they are found so callers can process them
+ * without holding every extracted body in memory at once.
  */
-function extractFunctions(content: string, language: string | undefined): ExtractedFunction[] {
+export function extractFunctions(content: string, language: string | undefined): Iterable<ExtractedFunction> {
   switch (language) {
     case 'javascript':
     case 'typescript':
-      return extractJavaScriptFunctions(content);
+      return iterJavaScriptFunctions(content);
     case 'python':
-      return extractPythonFunctions(content);
+      return iterPythonFunctions(content);
     default:
       return [];
   }
 }
 
 function detectLanguage(filePath: string): string | undefined {
-  const ext = extname(filePath).toLowerCase();
-  for (const [lang, exts] of Object.entries(LANGUAGE_EXTENSIONS)) {
-    if (exts.includes(ext)) {
-      return lang;
-    }
-  }
-  return undefined;
+  return LANGUAGE_BY_EXTENSION.get(extname(filePath).toLowerCase());
 }
 
-function matchesPattern(filePath: string, pattern: string): boolean {
-  // Simple glob matching
+type PathMatcher = (filePath: string) => boolean;
+
+// Simple glob matching, with each pattern reduced once to the literal it tests
+function compilePattern(pattern: string): PathMatcher {
   if (pattern.startsWith("**/")) {
-    const suffix = pattern.slice(3);
-    return filePath.endsWith(suffix.replace("*", ""));
+    const suffix = pattern.slice(3).replace("*", "");
+    return filePath => filePath.endsWith(suffix);
   }
   if (pattern.startsWith("*.")) {
-    return filePath.endsWith(pattern.slice(1));
+    const suffix = pattern.slice(1);
+    return filePath => filePath.endsWith(suffix);
+  }
+  return filePath => filePath.includes(pattern);
+}
+
+// True when any of the patterns matches
+function compilePatterns(patterns: string[]): PathMatcher {
+  const matchers = patterns.map(compilePattern);
+  if (matchers.length === 1) {
+    return matchers[0]!;
+  }
+  return filePath => matchers.some(m => m(filePath));
+}
+
+// Larger source files are almost always generated or vendored; index_directory
+// would read them whole into memory only for the embedding model to truncate
+// them. Skipped files are reported in the job status and result
+const MAX_INDEX_FILE_BYTES = 1024 * 1024;
+// A vendored tree can hold thousands of oversized files; only this many
+// paths are listed, files_skipped still gives the full count
+const MAX_REPORTED_SKIPPED_FILES = 50;
+
+/**
+ * Read a file's raw bytes once: decode them for content and take the size
+ * from the buffer rather than re-encoding the decoded string
+ */
+function readSource(filePath: string): { content: string; sizeBytes: number } {
+  const source = readFileSync(filePath);
+  return { content: source.toString("utf-8"), sizeBytes: source.length };
+}
+
+/**
+ * Collect files under root whose root-relative path matches an include
+ * pattern and no exclude pattern. Excluded directories are not descended.
+ * With maxBytes, larger files are returned in `oversized` instead of
+ * `files`, without being read.
+ * Walks with an explicit stack so deep trees cannot overflow the call stack.
+ */
+function findMatchingFiles(
+  root: string,
+  patterns: string[],
+  excludePatterns: string[],
+  maxBytes?: number
+): { files: string[]; oversized: string[] } {
+  const isIncluded = compilePatterns(patterns);
+  const isExcluded = compilePatterns(excludePatterns);
+  const files: string[] = [];
+  const oversized: string[] = [];
+  const stack: Array<[dir: string, relativeDir: string]> = [[root, ""]];
+
+  let next: [string, string] | undefined;
+  while ((next = stack.pop()) !== undefined) {
+    const [dir, relativeDir] = next;
+    const subdirs: Array<[string, string]> = [];
+
+    for (const entry of readdirSync(dir, { withFileTypes: true })) {
+      const relativePath = relativeDir ? join(relativeDir, entry.name) : entry.name;
+
+      // Check exclude patterns
+      if (isExcluded(relativePath)) {
+        continue;
+      }
+
+      if (entry.isDirectory()) {
+        subdirs.push([join(dir, entry.name), relativePath]);
+      } else if (entry.isFile()) {
+        // Check include patterns
+        if (isIncluded(relativePath)) {
+          const fullPath = join(dir, entry.name);
+          if (maxBytes !== undefined && statSync(fullPath).size > maxBytes) {
+            oversized.push(fullPath);
+            continue;
+          }
+          files.push(fullPath);
+        }
+      }
+    }
+
+    // Push in reverse so subdirectories are visited in directory order
+    for (let i = subdirs.length - 1; i >= 0; i--) {
+      stack.push(subdirs[i]!);
+    }
   }
-  return filePath.includes(pattern);
+
+  return { files, oversized };
 }
 
+// Doc types that also get a Neo4j node when indexed
+const GRAPH_DOC_TYPES: ReadonlySet<string> = new Set(["requirements", "design", "architecture"]);
+
+// Files embedded and stored at once by the directory indexers
+const INDEX_CONCURRENCY = 4;
+
+// Extracted functions embedded per Voyage request, capped by count and by
+// total characters so large functions don't overflow the request token limit
+const FUNCTION_BATCH_SIZE = 100;
+const FUNCTION_BATCH_MAX_CHARS = 200_000;
+
 // In-memory job tracking (would be persistent in production)
 const indexingJobs = new Map<string, {
   status: "running" | "completed" | "failed";
   files_processed: number;
   files_total: number;
+  files_skipped?: number;
+  skipped_files?: string[];
   started_at: string;
   completed_at?: string;
   error?: string;
@@ -340,7 +549,7 @@ export function registerIndexingTools(server: McpServer, ctx: ToolContext): void
           return toolError("FILE_NOT_FOUND", `File not found: ${input.file_path}`);
         }
 
-        const content = readFileSync(input.file_path, "utf-8");
+        const { content, sizeBytes } = readSource(input.file_path);
         const language = input.language || detectLanguage(input.file_path);
         const memoryId = randomUUID();
         const now = new Date().toISOString();
@@ -357,7 +566,7 @@ export function registerIndexingTools(server: McpServer, ctx: ToolContext): void
             metadata: {
               file_path: input.file_path,
               language: language,
-              size_bytes: Buffer.byteLength(content, "utf-8"),
+              size_bytes: sizeBytes,
               indexed_at: now
             },
             created_at: now,
@@ -374,7 +583,7 @@ export function registerIndexingTools(server: McpServer, ctx: ToolContext): void
         if (input.extract_functions && language) {
           // REQ-007-FN-073: Remove old function memories for this file before adding new ones
           try {
-            const existingFunctions = await ctx.qdrant.scroll(
+            const existingFunctions = ctx.qdrant.iterScroll(
               ctx.collectionName("function"),
               {
                 filter: {
@@ -383,28 +592,21 @@ export function registerIndexingTools(server: McpServer, ctx: ToolContext): void
                     { key: "project_id", match: { value: ctx.projectId } },
                     { key: "deleted", match: { value: false } }
                   ]
-                },
-                limit: 1000
+                }
               }
             );
 
-            // Mark old functions as deleted
-            for (const point of existingFunctions.points) {
-              await ctx.qdrant.upsert(ctx.collectionName("function"), {
-                id: point.id as string,
-                vector: point.vector as number[],
-                payload: {
-                  ...point.payload,
-                  deleted: true,
-                  updated_at: now
-                }
-              });
+            // Mark old functions as deleted, one write per page
+            let cleanedCount = 0;
+            for await (const page of existingFunctions) {
+              await ctx.qdrant.markDeleted(ctx.collectionName("function"), page.map(point => point.id));
+              cleanedCount += page.length;
             }
 
-            if (existingFunctions.points.length > 0) {
+            if (cleanedCount > 0) {
               logger.info("Cleaned up old function memories", {
                 file_path: input.file_path,
-                count: existingFunctions.points.length
+                count: cleanedCount
               });
             }
           } catch (error) {
@@ -412,17 +614,17 @@ export function registerIndexingTools(server: McpServer, ctx: ToolContext): void
             logger.debug("Could not clean up old functions", { error: String(error) });
           }
 
-          // Extract functions
-          const extractedFunctions = extractFunctions(content, language);
+          // Extract and store each function as a separate memory, embedding
+          // them in batches rather than one request per function
+          let batch: ExtractedFunction[] = [];
+          let batchChars = 0;
 
-          // Store each function as a separate memory
-          for (const func of extractedFunctions) {
-            const funcMemoryId = randomUUID();
-            const funcEmbedding = await ctx.voyage.embed(func.body);
+          const storeBatch = async (wait: boolean) => {
+            const embeddings = await ctx.voyage.embedBatch(batch.map(f => f.body));
 
-            await ctx.qdrant.upsert(ctx.collectionName("function"), {
-              id: funcMemoryId,
-              vector: funcEmbedding,
+            const points = batch.map((func, i) => ({
+              id: randomUUID(),
+              vector: embeddings[i]!,
               payload: {
                 type: "function",
                 content: func.body,
@@ -443,10 +645,38 @@ export function registerIndexingTools(server: McpServer, ctx: ToolContext): void
                 deleted: false,
                 project_id: ctx.projectId
               }
-            });
+            }));
 
-            functionMemoryIds.push(funcMemoryId);
-            functionsExtracted++;
+            // Store the whole batch in one write
+            await ctx.qdrant.upsertBatch(ctx.collectionName("function"), points, wait);
+            for (const point of points) {
+              functionMemoryIds.push(point.id);
+            }
+            functionsExtracted += points.length;
+
+            batch = [];
+            batchChars = 0;
+          };
+
+          for (const func of extractFunctions(content, language)) {
+            // Flush before a function that would take the batch past either
+            // cap; a single oversized function still goes alone
+            if (
+              batch.length >= FUNCTION_BATCH_SIZE ||
+              (batch.length > 0 && batchChars + func.body.length > FUNCTION_BATCH_MAX_CHARS)
+            ) {
+              // Intermediate batches don't wait to be applied; see below
+              await storeBatch(false);
+            }
+            batch.push(func);
+            batchChars += func.body.length;
+          }
+          // The last batch waits. Qdrant applies a collection's updates in
+          // order, so once it is applied every earlier batch is too, and the
+          // returned ids are searchable (and found by the cleanup above if
+          // the file is re-indexed straight away)
+          if (batch.length > 0) {
+            await storeBatch(true);
           }
 
           logger.info("Extracted functions", {
@@ -486,38 +716,29 @@ export function registerIndexingTools(server: McpServer, ctx: ToolContext): void
         }
 
         const jobId = randomUUID();
-        const files: string[] = [];
 
         // Find matching files
-        function walkDir(dir: string) {
-          const entries = readdirSync(dir, { withFileTypes: true });
-          for (const entry of entries) {
-            const fullPath = join(dir, entry.name);
-            const relativePath = relative(input.directory_path, fullPath);
-
-            // Check exclude patterns
-            if (input.exclude_patterns.some(p => matchesPattern(relativePath, p))) {
-              continue;
-            }
-
-            if (entry.isDirectory()) {
-              walkDir(fullPath);
-            } else if (entry.isFile()) {
-              // Check include patterns
-              if (input.patterns.some(p => matchesPattern(relativePath, p))) {
-                files.push(fullPath);
-              }
-            }
-          }
+        const { files, oversized } = findMatchingFiles(
+          input.directory_path,
+          input.patterns,
+          input.exclude_patterns,
+          MAX_INDEX_FILE_BYTES
+        );
+        if (oversized.length > 0) {
+          logger.info("Skipping files over the size limit", {
+            max_bytes: MAX_INDEX_FILE_BYTES,
+            count: oversized.length
+          });
         }
-
-        walkDir(input.directory_path);
+        const skippedFiles = oversized.slice(0, MAX_REPORTED_SKIPPED_FILES);
 
         // Start job tracking
         indexingJobs.set(jobId, {
           status: "running",
           files_processed: 0,
           files_total: files.length,
+          files_skipped: oversized.length,
+          skipped_files: skippedFiles,
           started_at: new Date().toISOString()
         });
 
@@ -525,8 +746,8 @@ export function registerIndexingTools(server: McpServer, ctx: ToolContext): void
         (async () => {
           const job = indexingJobs.get(jobId)!;
           try {
-            for (const filePath of files) {
-              const content = readFileSync(filePath, "utf-8");
+            await forEachConcurrent(files, INDEX_CONCURRENCY, async (filePath) => {
+              const { content, sizeBytes } = readSource(filePath);
               const language = detectLanguage(filePath);
               const memoryId = randomUUID();
               const now = new Date().toISOString();
@@ -542,7 +763,7 @@ export function registerIndexingTools(server: McpServer, ctx: ToolContext): void
                   metadata: {
                     file_path: filePath,
                     language: language,
-                    size_bytes: Buffer.byteLength(content, "utf-8"),
+                    size_bytes: sizeBytes,
                     indexed_at: now
                   },
                   created_at: now,
@@ -553,7 +774,7 @@ export function registerIndexingTools(server: McpServer, ctx: ToolContext): void
               });
 
               job.files_processed++;
-            }
+            });
 
             job.status = "completed";
             job.completed_at = new Date().toISOString();
@@ -568,6 +789,8 @@ export function registerIndexingTools(server: McpServer, ctx: ToolContext): void
           job_id: jobId,
           directory: input.directory_path,
           files_found: files.length,
+          files_skipped: oversized.length,
+          skipped_files: skippedFiles,
           status: "started"
         });
       } catch (error) {
@@ -646,30 +869,9 @@ export function registerIndexingTools(server: McpServer, ctx: ToolContext): void
         }
 
         const jobId = randomUUID();
-        const files: string[] = [];
 
         // Find matching files
-        function walkDir(dir: string) {
-          const entries = readdirSync(dir, { withFileTypes: true });
-          for (const entry of entries) {
-            const fullPath = join(dir, entry.name);
-            const relativePath = relative(input.directory_path, fullPath);
-
-            if (input.exclude_patterns.some(p => matchesPattern(relativePath, p))) {
-              continue;
-            }
-
-            if (entry.isDirectory()) {
-              walkDir(fullPath);
-            } else if (entry.isFile()) {
-              if (input.patterns.some(p => matchesPattern(relativePath, p))) {
-                files.push(fullPath);
-              }
-            }
-          }
-        }
-
-        walkDir(input.directory_path);
+        const { files } = findMatchingFiles(input.directory_path, input.patterns, input.exclude_patterns);
 
         // Start job tracking
         indexingJobs.set(jobId, {
@@ -683,13 +885,19 @@ export function registerIndexingTools(server: McpServer, ctx: ToolContext): void
         (async () => {
           const job = indexingJobs.get(jobId)!;
           try {
-            for (const filePath of files) {
-              const content = readFileSync(filePath, "utf-8");
+            // Read and embed a few docs ahead, but store and link them in
+            // order so each doc can find the ones indexed before it
+            const prepared = mapAhead(files, INDEX_CONCURRENCY, async (filePath) => {
+              const { content, sizeBytes } = readSource(filePath);
+              const embedding = await ctx.voyage.embed(content);
+              return { filePath, content, sizeBytes, embedding };
+            });
+
+            for await (const { filePath, content, sizeBytes, embedding } of prepared) {
               const memoryType = detectDocType(filePath);
               const memoryId = randomUUID();
               const now = new Date().toISOString();
 
-              const embedding = await ctx.voyage.embed(content);
               const collection = ctx.collectionName(memoryType);
 
               await ctx.qdrant.upsert(collection, {
@@ -701,7 +909,7 @@ export function registerIndexingTools(server: McpServer, ctx: ToolContext): void
                   metadata: {
                     file_path: filePath,
                     document: extractDocTitle(content, filePath),
-                    size_bytes: Buffer.byteLength(content, "utf-8"),
+                    size_bytes: sizeBytes,
                     indexed_at: now
                   },
                   created_at: now,
@@ -712,7 +920,7 @@ export function registerIndexingTools(server: McpServer, ctx: ToolContext): void
               });
 
               // Create graph node for graph-eligible doc types
-              if (["requirements", "design", "architecture"].includes(memoryType)) {
+              if (GRAPH_DOC_TYPES.has(memoryType)) {
                 try {
                   const contentSummary = content.substring(0, 500);
                   await ctx.neo4j.createNode(
@@ -727,19 +935,23 @@ export function registerIndexingTools(server: McpServer, ctx: ToolContext): void
 
                   // Auto-infer relationships to other docs
                   const graphTypes = ["requirements", "design", "architecture", "component"].filter(t => t !== memoryType);
+                  const docRelationships: Array<{ sourceId: string; type: string; targetId: string }> = [];
                   for (const searchType of graphTypes) {
                     try {
                       const searchCollection = ctx.collectionName(searchType);
                       const similar = await ctx.qdrant.searchSimilar(searchCollection, embedding, 3, 0.75);
+                      const relType = inferDocRelationshipType(memoryType, searchType);
                       for (const match of similar) {
-                        const relType = inferDocRelationshipType(memoryType, searchType);
-                        await ctx.neo4j.createRelationship(memoryId, relType, match.id);
-                        logger.info("Auto-created doc relationship", { from: memoryId, type: relType, to: match.id });
+                        docRelationships.push({ sourceId: memoryId, type: relType, targetId: match.id });
                       }
                     } catch {
                       // Collection may not exist
                     }
                   }
+                  if (docRelationships.length > 0) {
+                    const created = await ctx.neo4j.createRelationships(docRelationships);
+                    logger.info("Auto-created doc relationships", { from: memoryId, count: created });
+                  }
                 } catch (error) {
                   logger.warn("Failed to create graph node for doc", { error: String(error) });
                 }
@@ -800,10 +1012,13 @@ function detectDocType(filePath: string): string {
   return "design";
 }
 
+// Markdown level-1 heading (# Title)
+const MARKDOWN_TITLE_REGEX = /^#\s+(.+)$/m;
+
 // Extract document title from content or filename
 function extractDocTitle(content: string, filePath: string): string {
   // Try to find markdown title (# Title)
-  const titleMatch = content.match(/^#\s+(.+)$/m);
+  const titleMatch = MARKDOWN_TITLE_REGEX.exec(content);
   if (titleMatch && titleMatch[1]) {
     return titleMatch[1].trim();
   }
@@ -814,11 +1029,12 @@ function extractDocTitle(content: string, filePath: string): string {
 }
 
 // Infer relationship type for documentation
+const DOC_RELATIONSHIP_TYPES: ReadonlyMap<string, ReadonlyMap<string, string>> = new Map([
+  ["architecture", new Map([["requirements", "ADDRESSES"], ["design", "GUIDES"]])],
+  ["design", new Map([["requirements", "IMPLEMENTS"], ["architecture", "FOLLOWS"]])],
+  ["requirements", new Map([["design", "IMPLEMENTED_BY"]])]
+]);
+
 function inferDocRelationshipType(sourceType: string, targetType: string): string {
-  if (sourceType === "architecture" && targetType === "requirements") return "ADDRESSES";
-  if (sourceType === "architecture" && targetType === "design") return "GUIDES";
-  if (sourceType === "design" && targetType === "requirements") return "IMPLEMENTS";
-  if (sourceType === "design" && targetType === "architecture") return "FOLLOWS";
-  if (sourceType === "requirements" && targetType === "design") return "IMPLEMENTED_BY";
-  return "RELATED_TO";
+  return DOC_RELATIONSHIP_TYPES.get(sourceType)?.get(targetType) ?? "RELATED_TO";
 }
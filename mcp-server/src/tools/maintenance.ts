@@ -8,6 +8,7 @@ import { MEMORY_TYPES } from "../types/memory.js";
 import { logger } from "../utils/logger.js";
 
 const MemoryTypeSchema = z.enum(MEMORY_TYPES);
+const MEMORY_TYPE_SET: ReadonlySet<string> = new Set(MEMORY_TYPES);
 
 function toolResult(data: unknown) {
   return {
@@ -271,7 +272,7 @@ export function registerMaintenanceTools(server: McpServer, ctx: ToolContext): v
             };
 
             // Validate memory type
-            if (!MEMORY_TYPES.includes(record.type as typeof MEMORY_TYPES[number])) {
+            if (!MEMORY_TYPE_SET.has(record.type)) {
               errors++;
               continue;
             }
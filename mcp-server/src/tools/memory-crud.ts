@@ -2,6 +2,7 @@ import { randomUUID } from "node:crypto";
 import { z } from "zod";
 import { McpServer } from "@modelcontextprotocol/sdk/server/mcp.js";
 import type { ToolContext } from "../context.js";
+import type { ScrolledPoint } from "../types/index.js";
 import { MEMORY_TYPES } from "../types/memory.js";
 import { logger } from "../utils/logger.js";
 
@@ -37,34 +38,24 @@ async function cleanupOldTestResults(
     }
 
     // Get existing test results for this suite
-    const existingResults = await ctx.qdrant.scroll(collection, {
-      filter: { must: mustConditions },
-      limit: 1000
-    });
+    const existingResults: ScrolledPoint[] = [];
+    for await (const page of ctx.qdrant.iterScroll(collection, {
+      filter: { must: mustConditions }
+    })) {
+      existingResults.push(...page);
+    }
 
     // Sort by created_at descending (newest first)
-    const sorted = existingResults.points.sort((a, b) => {
-      const aTime = String((a.payload as Record<string, unknown>).created_at || "");
-      const bTime = String((b.payload as Record<string, unknown>).created_at || "");
+    const sorted = existingResults.sort((a, b) => {
+      const aTime = String(a.payload["created_at"] || "");
+      const bTime = String(b.payload["created_at"] || "");
       return bTime.localeCompare(aTime);
     });
 
     // Mark old results as deleted (keep the newest 'keepCount')
     const toDelete = sorted.slice(keepCount);
-    const now = new Date().toISOString();
-
-    for (const point of toDelete) {
-      await ctx.qdrant.upsert(collection, {
-        id: point.id as string,
-        vector: point.vector as number[],
-        payload: {
-          ...point.payload,
-          deleted: true,
-          updated_at: now
-        }
-      });
-      cleanedCount++;
-    }
+    await ctx.qdrant.markDeleted(collection, toDelete.map(point => point.id));
+    cleanedCount = toDelete.length;
 
     if (cleanedCount > 0) {
       logger.info("Cleaned up old test results", {
@@ -89,49 +80,58 @@ const RelationshipSchema = z.object({
 });
 
 // Memory types that should create Neo4j graph nodes for relationship tracking
-const GRAPH_ELIGIBLE_TYPES = [
+const GRAPH_ELIGIBLE_TYPES: ReadonlySet<string> = new Set([
   "requirements",    // Requirements → implemented by designs/components
   "design",          // Designs → implement requirements, guide components
   "architecture",    // ADRs → guide designs and components
   "component",       // Components → contain functions, implement designs
   "function",        // Functions → belong to components
   "test_result"      // Test results → verify components/requirements
-];
+]);
 
 function needsGraphNode(memoryType: string): boolean {
-  return GRAPH_ELIGIBLE_TYPES.includes(memoryType);
+  return GRAPH_ELIGIBLE_TYPES.has(memoryType);
 }
 
-// Infer relationship type based on source and target memory types
-function inferRelationshipType(sourceType: string, targetType: string): string {
+// Relationship type by source memory type, then target memory type
+const RELATIONSHIP_TYPES: ReadonlyMap<string, ReadonlyMap<string, string>> = new Map([
   // Architecture guides everything
-  if (sourceType === "architecture" && targetType === "requirements") return "GUIDES";
-  if (sourceType === "architecture" && targetType === "design") return "GUIDES";
-  if (sourceType === "architecture" && targetType === "component") return "GUIDES";
-
-  // Design implements requirements
-  if (sourceType === "design" && targetType === "requirements") return "IMPLEMENTS";
-  if (sourceType === "requirements" && targetType === "design") return "IMPLEMENTED_BY";
-
-  // Components implement designs
-  if (sourceType === "component" && targetType === "design") return "IMPLEMENTS";
-  if (sourceType === "design" && targetType === "component") return "IMPLEMENTED_BY";
-
+  ["architecture", new Map([
+    ["requirements", "GUIDES"],
+    ["design", "GUIDES"],
+    ["component", "GUIDES"]
+  ])],
+  // Design implements requirements; components implement designs
+  ["design", new Map([
+    ["requirements", "IMPLEMENTS"],
+    ["component", "IMPLEMENTED_BY"]
+  ])],
+  ["requirements", new Map([
+    ["design", "IMPLEMENTED_BY"],
+    ["test_result", "VERIFIED_BY"]
+  ])],
+  // Components contain functions, are tested, and can depend on each other
+  ["component", new Map([
+    ["design", "IMPLEMENTS"],
+    ["function", "CONTAINS"],
+    ["test_result", "TESTED_BY"],
+    ["component", "DEPENDS_ON"]
+  ])],
   // Functions belong to components
-  if (sourceType === "function" && targetType === "component") return "BELONGS_TO";
-  if (sourceType === "component" && targetType === "function") return "CONTAINS";
-
+  ["function", new Map([
+    ["component", "BELONGS_TO"]
+  ])],
   // Test results verify components and requirements
-  if (sourceType === "test_result" && targetType === "component") return "TESTS";
-  if (sourceType === "test_result" && targetType === "requirements") return "VERIFIES";
-  if (sourceType === "component" && targetType === "test_result") return "TESTED_BY";
-  if (sourceType === "requirements" && targetType === "test_result") return "VERIFIED_BY";
-
-  // Components can depend on other components
-  if (sourceType === "component" && targetType === "component") return "DEPENDS_ON";
+  ["test_result", new Map([
+    ["component", "TESTS"],
+    ["requirements", "VERIFIES"]
+  ])]
+]);
 
+// Infer relationship type based on source and target memory types
+function inferRelationshipType(sourceType: string, targetType: string): string {
   // Default: semantic similarity
-  return "RELATED_TO";
+  return RELATIONSHIP_TYPES.get(sourceType)?.get(targetType) ?? "RELATED_TO";
 }
 
 function toolResult(data: unknown) {
@@ -208,20 +208,20 @@ export function registerMemoryCrudTools(server: McpServer, ctx: ToolContext): vo
             );
 
             // Create explicit relationships if provided
-            if (input.relationships) {
-              for (const rel of input.relationships) {
-                await ctx.neo4j.createRelationship(
-                  memoryId,
-                  rel.type,
-                  rel.target_id
-                );
-              }
+            if (input.relationships && input.relationships.length > 0) {
+              await ctx.neo4j.createRelationships(
+                input.relationships.map(rel => ({
+                  sourceId: memoryId,
+                  type: rel.type,
+                  targetId: rel.target_id
+                }))
+              );
             }
 
             // Auto-infer relationships by semantic similarity
             // Search other graph-eligible types for related memories
             const autoRelationships: Array<{ targetId: string; type: string }> = [];
-            const graphTypes = GRAPH_ELIGIBLE_TYPES.filter(t => t !== input.memory_type);
+            const graphTypes = [...GRAPH_ELIGIBLE_TYPES].filter(t => t !== input.memory_type);
 
             for (const searchType of graphTypes) {
               try {
@@ -240,13 +240,38 @@ export function registerMemoryCrudTools(server: McpServer, ctx: ToolContext): vo
             }
 
             // Create auto-inferred relationships
-            for (const rel of autoRelationships) {
-              try {
-                await ctx.neo4j.createRelationship(memoryId, rel.type, rel.targetId);
-                logger.info("Auto-created relationship", { from: memoryId, type: rel.type, to: rel.targetId });
-              } catch (error) {
-                logger.warn("Failed to create auto-relationship", { error: String(error) });
+            // One batched write per relationship type; a failed batch is
+            // retried edge by edge so one bad edge doesn't drop the others
+            if (autoRelationships.length > 0) {
+              const targetsByType = new Map<string, string[]>();
+              for (const rel of autoRelationships) {
+                const targets = targetsByType.get(rel.type) ?? [];
+                targets.push(rel.targetId);
+                targetsByType.set(rel.type, targets);
+              }
+
+              let created = 0;
+              for (const [type, targetIds] of targetsByType) {
+                try {
+                  created += await ctx.neo4j.createRelationships(
+                    targetIds.map(targetId => ({ sourceId: memoryId, type, targetId }))
+                  );
+                } catch (error) {
+                  logger.warn("Batched auto-relationship write failed, retrying per edge", {
+                    type,
+                    error: String(error)
+                  });
+                  for (const targetId of targetIds) {
+                    try {
+                      await ctx.neo4j.createRelationship(memoryId, type, targetId);
+                      created++;
+                    } catch (error) {
+                      logger.warn("Failed to create auto-relationship", { to: targetId, error: String(error) });
+                    }
+                  }
+                }
               }
+              logger.info("Auto-created relationships", { from: memoryId, count: created });
             }
           } catch (error) {
             logger.warn("Failed to create graph node", { error: String(error) });
@@ -1,6 +1,7 @@
 import { z } from "zod";
 import { McpServer } from "@modelcontextprotocol/sdk/server/mcp.js";
 import type { ToolContext } from "../context.js";
+import { RESERVED_RELATED_FIELDS } from "../storage/neo4j.js";
 import { MEMORY_TYPES } from "../types/memory.js";
 import { logger } from "../utils/logger.js";
 
@@ -200,14 +201,22 @@ export function registerSearchTools(server: McpServer, ctx: ToolContext): void {
     {
       entity_id: z.string().uuid(),
       relationship_types: z.array(z.string()).optional(),
-      depth: z.number().min(1).max(5).default(1)
+      depth: z.number().min(1).max(5).default(1),
+      limit: z.number().min(1).max(100).default(50),
+      fields: z.array(
+        z.string().refine(field => !RESERVED_RELATED_FIELDS.has(field), {
+          message: "memory_id and distance are always returned and can't be requested as fields"
+        })
+      ).optional()
     },
     async (input) => {
       try {
         const related = await ctx.neo4j.getRelated(
           input.entity_id,
           input.relationship_types,
-          input.depth
+          input.depth,
+          input.limit,
+          input.fields
         );
 
         return toolResult({
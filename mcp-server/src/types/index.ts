@@ -23,3 +23,21 @@ export interface SearchResult {
   score: number;
   payload: Record<string, unknown>;
 }
+
+export interface ScrollParams {
+  filter?: SearchParams["filter"];
+  limit?: number;
+  offset?: string | number;
+  withVector?: boolean;
+}
+
+export interface ScrolledPoint {
+  id: string;
+  vector?: number[];
+  payload: Record<string, unknown>;
+}
+
+export interface ScrollPage {
+  points: ScrolledPoint[];
+  nextOffset: string | number | null;
+}
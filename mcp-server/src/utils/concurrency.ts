@@ -0,0 +1,63 @@
+/**
+ * Run fn over items with at most `limit` calls in flight at once.
+ * Items are started in order. The first failure stops further items from
+ * starting; the returned promise rejects with it only once the calls
+ * already in flight have settled, so nothing is still running afterwards.
+ */
+export async function forEachConcurrent<T>(
+  items: readonly T[],
+  limit: number,
+  fn: (item: T) => Promise<void>
+): Promise<void> {
+  let next = 0;
+  let failure: { error: unknown } | undefined;
+
+  async function worker(): Promise<void> {
+    while (failure === undefined && next < items.length) {
+      const item = items[next++]!;
+      try {
+        await fn(item);
+      } catch (error) {
+        failure ??= { error };
+      }
+    }
+  }
+
+  const workers = Math.max(1, Math.min(limit, items.length));
+  // Workers never reject, so this waits for every in-flight call
+  await Promise.all(Array.from({ length: workers }, worker));
+  if (failure !== undefined) {
+    throw failure.error;
+  }
+}
+
+/**
+ * Yield fn(item) for each item, in order, while keeping up to `limit` calls
+ * running ahead of the consumer. Use when results must be handled
+ * sequentially but producing them is slow and independent.
+ */
+export async function* mapAhead<T, R>(
+  items: readonly T[],
+  limit: number,
+  fn: (item: T) => Promise<R>
+): AsyncGenerator<R> {
+  const pending: Promise<R>[] = [];
+  let next = 0;
+
+  function fill(): void {
+    while (next < items.length && pending.length < Math.max(1, limit)) {
+      const result = fn(items[next++]!);
+      // Rejections surface when this result is awaited in turn; mark them
+      // handled so one pending behind a failure isn't reported as unhandled
+      result.catch(() => {});
+      pending.push(result);
+    }
+  }
+
+  fill();
+  while (pending.length > 0) {
+    const result = await pending.shift()!;
+    fill();
+    yield result;
+  }
+}
@@ -0,0 +1,128 @@
+/**
+ * Concurrency helper tests
+ */
+import { describe, it, expect } from 'vitest';
+import { forEachConcurrent, mapAhead } from '../src/utils/concurrency.js';
+
+function delay(ms: number): Promise<void> {
+  return new Promise(resolve => setTimeout(resolve, ms));
+}
+
+// Wraps fn so the test can see how many calls were running at once
+function tracked<T, R>(fn: (item: T) => Promise<R>) {
+  const stats = { active: 0, peak: 0, started: [] as T[], finished: [] as T[] };
+  const wrapped = async (item: T): Promise<R> => {
+    stats.active++;
+    stats.peak = Math.max(stats.peak, stats.active);
+    stats.started.push(item);
+    try {
+      return await fn(item);
+    } finally {
+      stats.active--;
+      stats.finished.push(item);
+    }
+  };
+  return { stats, wrapped };
+}
+
+async function collect<R>(gen: AsyncGenerator<R>): Promise<R[]> {
+  const out: R[] = [];
+  for await (const value of gen) {
+    out.push(value);
+  }
+  return out;
+}
+
+describe('forEachConcurrent', () => {
+  it('never runs more than limit calls at once', async () => {
+    const { stats, wrapped } = tracked(async (n: number) => delay(n % 3));
+    const items = Array.from({ length: 20 }, (_, i) => i);
+
+    await forEachConcurrent(items, 4, wrapped);
+
+    expect(stats.peak).toBe(4);
+    expect(stats.finished.sort((a, b) => a - b)).toEqual(items);
+  });
+
+  it('starts items in order', async () => {
+    const { stats, wrapped } = tracked(async () => delay(1));
+    const items = [0, 1, 2, 3, 4, 5];
+
+    await forEachConcurrent(items, 2, wrapped);
+
+    expect(stats.started).toEqual(items);
+  });
+
+  it('runs at least one call when limit is below 1', async () => {
+    const { stats, wrapped } = tracked(async () => delay(1));
+
+    await forEachConcurrent([1, 2, 3], 0, wrapped);
+
+    expect(stats.peak).toBe(1);
+    expect(stats.finished).toEqual([1, 2, 3]);
+  });
+
+  it('rejects only after in-flight calls have settled', async () => {
+    const { stats, wrapped } = tracked(async (n: number) => {
+      if (n === 0) {
+        await delay(1);
+        throw new Error('boom');
+      }
+      await delay(20);
+    });
+
+    await expect(forEachConcurrent([0, 1, 2, 3, 4], 3, wrapped)).rejects.toThrow('boom');
+
+    // 1 and 2 were already running when 0 failed; nothing is left running
+    // and nothing new was started after the failure
+    expect(stats.active).toBe(0);
+    expect(stats.finished).toContain(1);
+    expect(stats.finished).toContain(2);
+    expect(stats.started).toEqual([0, 1, 2]);
+  });
+
+  it('rejects with the first failure', async () => {
+    const fn = async (n: number) => {
+      await delay(n * 5);
+      throw new Error(`fail ${n}`);
+    };
+
+    await expect(forEachConcurrent([1, 2], 2, fn)).rejects.toThrow('fail 1');
+  });
+});
+
+describe('mapAhead', () => {
+  it('yields results in input order regardless of completion order', async () => {
+    const delays = [15, 1, 10, 0, 5];
+
+    const results = await collect(mapAhead(delays, 3, async (ms) => {
+      await delay(ms);
+      return ms * 2;
+    }));
+
+    expect(results).toEqual([30, 2, 20, 0, 10]);
+  });
+
+  it('never runs more than limit calls at once', async () => {
+    const { stats, wrapped } = tracked(async (n: number) => {
+      await delay(2);
+      return n;
+    });
+    const items = Array.from({ length: 12 }, (_, i) => i);
+
+    const results = await collect(mapAhead(items, 3, wrapped));
+
+    expect(results).toEqual(items);
+    expect(stats.peak).toBe(3);
+  });
+
+  it('surfaces a failure when its result is reached', async () => {
+    const gen = mapAhead([1, 2, 3], 2, async (n) => {
+      if (n === 2) throw new Error('bad item');
+      return n;
+    });
+
+    expect((await gen.next()).value).toBe(1);
+    await expect(gen.next()).rejects.toThrow('bad item');
+  });
+});
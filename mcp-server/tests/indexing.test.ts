@@ -0,0 +1,147 @@
+/**
+ * JS/TS function extraction tests
+ *
+ * Expected spans were produced by the per-function brace scan that the
+ * one-pass brace index replaced, so these pin the two as equivalent.
+ */
+import { describe, it, expect } from 'vitest';
+import { extractFunctions } from '../src/tools/indexing.js';
+
+function spans(source: string) {
+  return [...extractFunctions(source, 'typescript')].map(fn => ({
+    name: fn.name,
+    startLine: fn.startLine,
+    endLine: fn.endLine,
+    isMethod: fn.isMethod,
+    className: fn.className
+  }));
+}
+
+function free(name: string, startLine: number, endLine: number) {
+  return { name, startLine, endLine, isMethod: false, className: undefined };
+}
+
+describe('extractFunctions (typescript)', () => {
+  it('ends a function at its own closing brace, not a nested one', () => {
+    const source = [
+      'export function outer(items: number[]): number {',
+      '  let total = 0;',
+      '  for (const item of items) {',
+      '    if (item > 0) {',
+      '      total += item;',
+      '    } else {',
+      '      total -= item;',
+      '    }',
+      '  }',
+      '  return total;',
+      '}',
+      '',
+      'function after() {',
+      '  return 1;',
+      '}'
+    ].join('\n');
+
+    expect(spans(source)).toEqual([free('outer', 1, 11), free('after', 13, 15)]);
+  });
+
+  it('counts braces inside strings and comments', () => {
+    const source = [
+      'function template(name: string): string {',
+      '  const open = "{";',
+      '  const close = "}";',
+      '  // balanced in a comment: { }',
+      '  return `${open}${name}${close}`;',
+      '}',
+      '',
+      'function unbalanced(): string {',
+      '  // a lone brace in a comment: {',
+      '  return "x";',
+      '}',
+      '',
+      'function next(): number {',
+      '  return 2;',
+      '}'
+    ].join('\n');
+
+    // Balanced braces cancel out; the lone one keeps unbalanced() open to
+    // the end of the file, as the previous scan did
+    expect(spans(source)).toEqual([
+      free('template', 1, 6),
+      free('unbalanced', 8, 15),
+      free('next', 13, 15)
+    ]);
+  });
+
+  it('finds class methods and the functions after the class', () => {
+    const source = [
+      'export class Store {',
+      '  private items = new Map<string, number>();',
+      '',
+      '  constructor() {',
+      '    this.items.clear();',
+      '  }',
+      '',
+      '  find(key: string): number | undefined {',
+      '    if (this.items.has(key)) {',
+      '      return this.items.get(key);',
+      '    }',
+      '    return undefined;',
+      '  }',
+      '',
+      '  async load(keys: string[]): Promise<void> {',
+      '    for (const key of keys) {',
+      '      this.items.set(key, key.length);',
+      '    }',
+      '  }',
+      '}',
+      '',
+      'function standalone() {',
+      '  return new Store();',
+      '}'
+    ].join('\n');
+
+    expect(spans(source)).toEqual([
+      { name: 'find', startLine: 8, endLine: 13, isMethod: true, className: 'Store' },
+      { name: 'load', startLine: 15, endLine: 19, isMethod: true, className: 'Store' },
+      free('standalone', 22, 24)
+    ]);
+  });
+
+  it('finds block and expression-bodied arrow functions', () => {
+    const source = [
+      'const double = (n: number): number => n * 2;',
+      '',
+      'export const fetchAll = async (urls: string[]) => {',
+      '  const results = [];',
+      '  for (const url of urls) {',
+      '    results.push(await fetch(url));',
+      '  }',
+      '  return results;',
+      '};',
+      '',
+      'const handlers = {',
+      '  ok: () => {},',
+      '};',
+      '',
+      'let last = (x: number) => {',
+      '  return { value: x };',
+      '};'
+    ].join('\n');
+
+    // An expression body has no brace of its own, so it runs on to the end
+    // of the next braced block, as the previous scan did
+    expect(spans(source)).toEqual([
+      free('double', 1, 9),
+      free('fetchAll', 3, 9),
+      free('last', 15, 17)
+    ]);
+  });
+
+  it('marks async functions and keeps the declaration as the signature', () => {
+    const [fn] = [...extractFunctions('export async function load(id: string) {\n  return id;\n}', 'typescript')];
+
+    expect(fn?.isAsync).toBe(true);
+    expect(fn?.signature).toBe('export async function load(id: string)');
+    expect(fn?.body).toBe('export async function load(id: string) {\n  return id;\n}');
+  });
+});
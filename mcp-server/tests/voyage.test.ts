@@ -0,0 +1,97 @@
+/**
+ * Voyage client tests - the API is replaced with a stubbed fetch
+ */
+import { describe, it, expect, vi, afterEach } from 'vitest';
+import { VoyageClient } from '../src/embedding/voyage.js';
+
+// Little-endian float32 [1.0, -2.5, 0.5]
+const KNOWN_PAYLOAD = 'AACAPwAAIMAAAAA/';
+
+// Each input is embedded as a single float: its position in the
+// sequence of texts the stub has been asked for, so tests can tell
+// fetched embeddings apart
+function stubVoyage(encode?: (text: string) => string) {
+  let counter = 0;
+  const fetchMock = vi.fn(async (_url: string, init: { body: string }) => {
+    const { input } = JSON.parse(init.body) as { input: string[] };
+    const data = input.map((text, index) => ({
+      embedding: encode
+        ? encode(text)
+        : Buffer.from(new Float32Array([counter++]).buffer).toString('base64'),
+      index
+    }));
+    return new Response(JSON.stringify({ data, usage: { total_tokens: input.length } }));
+  });
+  vi.stubGlobal('fetch', fetchMock);
+  return fetchMock;
+}
+
+function requestedTexts(fetchMock: ReturnType<typeof stubVoyage>): string[] {
+  return fetchMock.mock.calls.flatMap(([, init]) => (JSON.parse(init.body) as { input: string[] }).input);
+}
+
+afterEach(() => {
+  vi.unstubAllGlobals();
+});
+
+describe('VoyageClient', () => {
+  it('decodes base64 float32 embeddings', async () => {
+    stubVoyage(() => KNOWN_PAYLOAD);
+    const client = new VoyageClient('test-key');
+
+    expect(await client.embed('hello')).toEqual([1, -2.5, 0.5]);
+  });
+
+  it('serves repeated texts from the cache', async () => {
+    const fetchMock = stubVoyage();
+    const client = new VoyageClient('test-key');
+
+    const first = await client.embedBatch(['a', 'b']);
+    const second = await client.embedBatch(['b', 'a']);
+
+    expect(fetchMock).toHaveBeenCalledTimes(1);
+    expect(second).toEqual([first[1], first[0]]);
+  });
+
+  it('requests a text repeated within one batch only once', async () => {
+    const fetchMock = stubVoyage();
+    const client = new VoyageClient('test-key');
+
+    const result = await client.embedBatch(['x', 'y', 'x']);
+
+    expect(requestedTexts(fetchMock)).toEqual(['x', 'y']);
+    expect(result[2]).toEqual(result[0]);
+  });
+
+  it('only fetches the uncached texts of a partly cached batch', async () => {
+    const fetchMock = stubVoyage();
+    const client = new VoyageClient('test-key');
+
+    await client.embed('cached');
+    await client.embedBatch(['cached', 'new']);
+
+    expect(requestedTexts(fetchMock)).toEqual(['cached', 'new']);
+  });
+
+  it('evicts the least recently used embedding at capacity', async () => {
+    const fetchMock = stubVoyage();
+    const client = new VoyageClient('test-key');
+    // One more than the cache holds, so text-0 is evicted on insert
+    const texts = Array.from({ length: 1025 }, (_, i) => `text-${i}`);
+
+    await client.embedBatch(texts);
+    expect(requestedTexts(fetchMock)).toHaveLength(1025);
+
+    // A hit on text-1 makes text-2 the least recently used entry
+    await client.embed('text-1');
+    expect(requestedTexts(fetchMock)).toHaveLength(1025);
+
+    // text-0 was evicted and is fetched again, which evicts text-2
+    await client.embed('text-0');
+    expect(requestedTexts(fetchMock).slice(1025)).toEqual(['text-0']);
+
+    await client.embed('text-1');
+    await client.embed('text-2');
+    expect(requestedTexts(fetchMock).slice(1025)).toEqual(['text-0', 'text-2']);
+  });
+});
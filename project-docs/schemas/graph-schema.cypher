@@ -6,6 +6,19 @@
 // NODE DEFINITIONS
 // ==============================================================================
 
+// ------------------------------------------------------------------------------
+// Memory Label (shared)
+// ------------------------------------------------------------------------------
+// Every memory node carries :Memory alongside its type label, so lookups by
+// memory_id or project_id use an index whatever the node's type.
+// Created by Neo4jAdapter.ensureSchema() at server startup.
+
+CREATE INDEX memory_id_idx IF NOT EXISTS
+FOR (n:Memory) ON (n.memory_id);
+
+CREATE INDEX memory_project_id_idx IF NOT EXISTS
+FOR (n:Memory) ON (n.project_id);
+
 // ------------------------------------------------------------------------------
 // Function Node
 // ------------------------------------------------------------------------------
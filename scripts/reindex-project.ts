@@ -121,12 +121,20 @@ async function main() {
     config.neo4j.uri,
     config.neo4j.user,
     config.neo4j.password,
-    PROJECT_ID
+    PROJECT_ID,
+    config.neo4j.database
   );
   const voyage = new VoyageClient(config.voyage.api_key);
 
   await neo4j.verifyConnectivity();
 
+  // Indexes and the one-time :Memory label backfill
+  try {
+    await neo4j.ensureSchema();
+  } catch (error) {
+    console.warn('Neo4j schema setup failed - graph lookups may be slow or miss older nodes:', error);
+  }
+
   // Ensure collections exist
   console.log('Ensuring collections...');
   await qdrant.ensureAllCollections();